@@ -3,19 +3,122 @@ Claw Machine Game - Pixel Art Style
 Press ENTER to insert a coin and start playing!
 """
 
+import time
+IMPORT_STARTED = time.perf_counter()  # For the startup breakdown (see StartupTimes)
+
+import argparse
+import atexit
+import enum
+import hashlib
+import importlib
+import json
+import numpy as np
+import os
 import pygame
 import sys
 import random
-import numpy as np
+import struct
+import subprocess
+import tempfile
+import threading
+import tracemalloc
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Pygame subsystems are initialised by bootstrap(), only for the runs that
+# need them, so importing this module for Claw, the dolls or the constants
+# does not open a window or an audio device
+
+class LazyModule:
+    """Stand-in for a module that is imported the first time it is used
+    
+    The first attribute lookup imports the module, records how long that
+    took in STARTUP and replaces the stand-in's global with the module, so
+    later lookups cost nothing extra.
+    """
+    def __init__(self, name, alias=None):
+        self._name = name
+        self._alias = alias or name
+    
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+    
+    def load(self):
+        start = time.perf_counter()
+        already_loaded = self._name in sys.modules
+        module = importlib.import_module(self._name)
+        if not already_loaded:
+            STARTUP.record(f"import {self._name} (lazy)", start)
+        globals()[self._alias] = module
+        return module
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+# Imports only some runs need wait until they are used: asyncio for
+# --telemetry, shared memory for --sample-bank and pygame's SDL2 video
+# bindings for --renderer. numpy is imported directly, as pygame imports it
+# anyway.
+asyncio = LazyModule("asyncio")
+resource_tracker = LazyModule("multiprocessing.resource_tracker", "resource_tracker")
+shared_memory = LazyModule("multiprocessing.shared_memory", "shared_memory")
+sdl2_video = LazyModule("pygame._sdl2.video", "sdl2_video")  # Only for the texture renderer
+
+class StartupTimes:
+    """Where the time went between starting to import this module and the first frame
+    
+    Phases are listed in the order they finished. Some run inside others
+    (the sound effects load while the Game is built), so they need not add
+    up to the total.
+    """
+    def __init__(self):
+        self.phases = []  # (name, seconds)
+    
+    def record(self, name, start):
+        """Note a phase that began at perf_counter() time start and has just ended"""
+        self.phases.append((name, time.perf_counter() - start))
+    
+    def report(self):
+        width = max([len(name) for name, _ in self.phases] + [5])
+        lines = [f"{name:<{width}} {seconds * 1000:8.1f} ms" for name, seconds in self.phases]
+        lines.append(f"{'total':<{width}} {(time.perf_counter() - IMPORT_STARTED) * 1000:8.1f} ms "
+                     f"since this module started importing")
+        return "\n".join(lines)
+
+STARTUP = StartupTimes()
+
+def bootstrap(display=True, fonts=True, mixer=True):
+    """Initialise the pygame subsystems a run needs, timing each one
+    
+    Subsystems that are already running are left alone, so this is safe to
+    call again. Returns False if the mixer was wanted but could not start;
+    the game then plays without sound.
+    """
+    if display and not pygame.display.get_init():
+        start = time.perf_counter()
+        pygame.display.init()
+        STARTUP.record("pygame.display.init", start)
+    if fonts and not pygame.font.get_init():
+        start = time.perf_counter()
+        pygame.font.init()
+        STARTUP.record("pygame.font.init", start)
+    if mixer and not pygame.mixer.get_init():
+        start = time.perf_counter()
+        try:
+            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        except pygame.error as e:
+            print(f"Audio unavailable - continuing without sound: {e}")
+            return False
+        STARTUP.record("pygame.mixer.init", start)
+    return True
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+STEP = 1 / FPS  # Seconds of game time advanced by each Game.update()
+MAX_FRAME_TIME = 0.25  # Longest stall the main loop catches up on
+SAMPLE_RATE = 22050
+MUSIC_CHANNEL = 0  # Mixer channel reserved for the background music stream
+COINS_PER_ROUND = 12
+WIN_SCORE = 5  # Dolls needed in one round to win
 
 # Colors - Pixel Art Palette
 BLACK = (0, 0, 0)
@@ -53,198 +156,428 @@ OWL_COLORS = [
     (80, 60, 40),     # Dark Brown
 ]
 
-# Sound Generator Class
-class SoundGenerator:
-    """Generate simple sound effects using pygame"""
+# Note event synthesis
+class NoteSynth:
+    """Render many notes at once into a preallocated float64 buffer
+    
+    Notes are rows of a structured array (see NoteSynth.notes). Rendering
+    walks the output in fixed-size blocks; within a block every sample of
+    every active note is computed in one batch of numpy operations and
+    scatter-added with np.bincount, so there is no per-note Python work.
+    """
+    # Sample positions and lengths are in samples, times in seconds
+    FIELDS = [
+        ("freq", "f8"),           # Start frequency (Hz)
+        ("freq_end", "f8"),       # End frequency for a linear glide (Hz)
+        ("start", "i8"),          # First output sample
+        ("length", "i8"),         # Number of samples
+        ("amplitude", "f8"),
+        ("decay", "f8"),          # Exponential decay rate (1/s)
+        ("attack", "i8"),         # Fade-in length (samples)
+        ("attack_curve", "f8"),   # Fade-in shape exponent (1 = linear)
+        ("release", "i8"),        # Linear fade-out length (samples)
+        ("vibrato_depth", "f8"),  # Hz
+        ("vibrato_rate", "f8"),   # Hz
+    ]
+    
+    # Piano-like timbre as (harmonic, gain) pairs
+    PIANO = ((1, 1.0), (2, 0.3), (3, 0.15), (4, 0.08))
     
     @staticmethod
-    def generate_tone(frequency, duration, volume=0.3):
-        """Generate a simple tone"""
-        sample_rate = 22050
-        n_samples = int(sample_rate * duration)
+    def notes(**fields):
+        """Build a note table; scalar fields are broadcast to every note"""
+        count = max(np.size(value) for value in fields.values())
+        notes = np.zeros(count, dtype=NoteSynth.FIELDS)
+        notes["attack_curve"] = 1.0
+        for name, value in fields.items():
+            notes[name] = value
+        if "freq_end" not in fields:
+            notes["freq_end"] = notes["freq"]
+        return notes
+    
+    @staticmethod
+    def render(notes, out, harmonics=((1, 1.0),), sample_rate=SAMPLE_RATE, chunk_size=256, batch_size=256,
+               origin=0):
+        """Add every note into out (a contiguous float64 buffer) in place and return it
         
-        # Generate sine wave
-        t = np.linspace(0, duration, n_samples, False)
-        wave = np.sin(frequency * t * 2 * np.pi)
+        out[0] is sample `origin` of the timeline the notes' starts refer to,
+        so a long piece can be rendered one buffer at a time: notes that began
+        in an earlier buffer continue where they left off. origin must be a
+        multiple of chunk_size.
         
-        # Apply envelope (fade in/out)
-        envelope = np.ones(n_samples)
-        fade_len = int(sample_rate * 0.01)  # 10ms fade
-        envelope[:fade_len] = np.linspace(0, 1, fade_len)
-        envelope[-fade_len:] = np.linspace(1, 0, fade_len)
-        wave = wave * envelope * volume
+        Harmonics must be whole multiples of the fundamental. The output is
+        split into chunks of chunk_size samples and each note is rendered as
+        the chunks it overlaps. For notes without glide or vibrato, a per-note
+        table of one chunk's sine, cosine and decay is rotated to each chunk's
+        starting phase, so only a few transcendental functions are evaluated
+        per chunk rather than per sample. Chunks are processed batch_size at a
+        time in output order, which bounds peak memory, and chunks landing on
+        the same output samples are summed with np.add.reduceat.
+        """
+        if not out.flags.c_contiguous:
+            raise ValueError("output buffer must be contiguous")
+        multiples = [int(harmonic) for harmonic, gain in harmonics]
+        if any(harmonic < 1 or harmonic != multiple for (harmonic, gain), multiple in zip(harmonics, multiples)):
+            raise ValueError("harmonics must be positive whole multiples")
+        if origin % chunk_size:
+            raise ValueError("origin must be a multiple of chunk_size")
+        gain_by_harmonic = [0.0] * (max(multiples) + 1)
+        for (harmonic, gain), multiple in zip(harmonics, multiples):
+            gain_by_harmonic[multiple] += gain
         
-        # Convert to 16-bit integers
-        wave = (wave * 32767).astype(np.int16)
+        # Drop notes outside the buffer and trim the ones running past its end.
+        # Starts are relative to out[0]; negative for notes already playing.
+        notes = notes[(notes["start"] >= 0) & (notes["start"] < origin + len(out))
+                      & (notes["start"] + notes["length"] > origin) & (notes["length"] > 0)]
+        if len(notes) == 0:
+            return out
+        starts = notes["start"] - origin
+        ends = notes["length"]  # Note-relative, where the release fade finishes
+        lengths = np.minimum(ends, len(out) - starts)
+        freq = notes["freq"]
+        # Frequency slope in Hz per second, reaching freq_end on the last sample
+        glide = (notes["freq_end"] - freq) * sample_rate / np.maximum(notes["length"] - 1, 1)
+        rate = notes["vibrato_rate"]
+        vibrato = np.divide(notes["vibrato_depth"], rate, out=np.zeros(len(notes)), where=rate > 0)
+        modulated = (glide != 0) | (vibrato != 0)
+        amplitude = notes["amplitude"]
+        decay = notes["decay"]
+        attack = notes["attack"]
+        attack_curve = notes["attack_curve"]
+        release = notes["release"]
         
-        # Create stereo sound
-        stereo_wave = np.column_stack((wave, wave))
+        # One chunk of each note's steady sine, cosine and decay
+        j = np.arange(chunk_size)
+        omega = 2 * np.pi * freq / sample_rate
+        sin_table = np.sin(np.outer(omega, j))
+        cos_table = np.cos(np.outer(omega, j))
+        decay_table = np.exp(-np.outer(decay, j / sample_rate))
         
-        sound = pygame.sndarray.make_sound(stereo_wave)
-        return sound
-    
-    @staticmethod
-    def coin_sound():
-        """Coin insertion sound - bright metallic clink with echo"""
-        sample_rate = 22050
-        duration = 0.3
-        n_samples = int(sample_rate * duration)
+        # Every output chunk each note overlaps, in output order. A chunk's
+        # offset is the note-relative index of its first sample, negative when
+        # the note starts partway through it.
+        first_chunk = np.maximum(starts, 0) // chunk_size
+        counts = (starts + lengths - 1) // chunk_size - first_chunk + 1
+        chunk_note = np.repeat(np.arange(len(notes)), counts)
+        chunk_index = np.repeat(first_chunk - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        order = np.argsort(chunk_index, kind="stable")
+        chunk_note = chunk_note[order]
+        chunk_index = chunk_index[order]
+        chunk_offset = chunk_index * chunk_size - starts[chunk_note]
         
-        # Create two metallic hits with echo effect
-        t = np.linspace(0, duration, n_samples, False)
+        full_chunks = len(out) // chunk_size
+        out_chunks = out[:full_chunks * chunk_size].reshape(full_chunks, chunk_size)
         
-        # Main hit (high frequency)
-        main_freq = 1200
-        wave1 = np.sin(main_freq * t * 2 * np.pi) * np.exp(-t * 15)
+        # Work buffers reused by every batch, so the hot loop allocates very little
+        work = np.empty((6, min(batch_size, len(order)), chunk_size))
         
-        # Second harmonic
-        wave2 = np.sin(main_freq * 1.5 * t * 2 * np.pi) * np.exp(-t * 20) * 0.5
+        for first in range(0, len(order), batch_size):
+            note = chunk_note[first:first + batch_size]
+            offset = chunk_offset[first:first + batch_size]
+            index = chunk_index[first:first + batch_size]
+            sin_t, cos_t, current, cosine, previous, wave = work[:, :len(note)]
+            
+            # Fundamental: rotate the note's table to the chunk's starting phase
+            start_phase = omega[note] * offset
+            s0 = np.sin(start_phase)[:, None]
+            c0 = np.cos(start_phase)[:, None]
+            np.take(sin_table, note, axis=0, out=sin_t)
+            np.take(cos_table, note, axis=0, out=cos_t)
+            np.multiply(s0, cos_t, out=current)
+            np.multiply(c0, sin_t, out=wave)
+            current += wave
+            np.multiply(c0, cos_t, out=cosine)
+            np.multiply(s0, sin_t, out=wave)
+            cosine -= wave
+            
+            # Gliding or vibrating notes integrate their frequency directly
+            rows = np.flatnonzero(modulated[note])
+            if rows.size:
+                m = note[rows][:, None]
+                t = (offset[rows][:, None] + j) / sample_rate
+                phase = 2 * np.pi * (freq[m] + 0.5 * glide[m] * t) * t
+                phase += vibrato[m] * (1 - np.cos(2 * np.pi * rate[m] * t))
+                current[rows] = np.sin(phase)
+                cosine[rows] = np.cos(phase)
+            
+            # Harmonics by sin((k+1)x) = 2cos(x)sin(kx) - sin((k-1)x), with
+            # sin_t and cos_t free to reuse as scratch from here on
+            np.multiply(current, gain_by_harmonic[1], out=wave)
+            if len(gain_by_harmonic) > 2:
+                two_cos = cosine
+                two_cos *= 2
+                following = sin_t
+                for k in range(2, len(gain_by_harmonic)):
+                    np.multiply(two_cos, current, out=following)
+                    if k > 2:  # sin(0x) is 0, so there is nothing to subtract for k = 2
+                        following -= previous
+                    previous, current, following = current, following, previous
+                    if gain_by_harmonic[k]:
+                        np.multiply(current, gain_by_harmonic[k], out=cos_t)
+                        wave += cos_t
+            
+            # Envelope: decay, then the attack ramp (and samples before the
+            # note starts) and the release ramp (and samples after it ends),
+            # only on the rows they touch
+            wave *= (amplitude[note] * np.exp(-decay[note] * offset / sample_rate))[:, None]
+            wave *= decay_table[note]
+            rows = np.flatnonzero(offset < np.maximum(attack[note], 1))
+            if rows.size:
+                m = note[rows][:, None]
+                i = offset[rows][:, None] + j
+                top = np.maximum(attack[m] - 1, 0)
+                ramp = (np.clip(i, 0, top) / np.maximum(top, 1)) ** attack_curve[m]
+                ramp[i < 0] = 0
+                ramp[i >= attack[m]] = 1
+                wave[rows] *= ramp
+            rows = np.flatnonzero(offset + chunk_size > ends[note] - release[note])
+            if rows.size:
+                m = note[rows][:, None]
+                i = offset[rows][:, None] + j
+                end = ends[m]
+                fade = (end - 1 - i) / np.maximum(release[m] - 1, 1)
+                fade[i < end - release[m]] = 1
+                fade[i >= end] = 0
+                wave[rows] *= fade
+            
+            # Sum chunks that share output samples, then add them in place
+            group_starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+            sums = np.add.reduceat(wave, group_starts, axis=0)
+            targets = index[group_starts]
+            full = targets < full_chunks
+            out_chunks[targets[full]] += sums[full]
+            if not full.all():
+                out[full_chunks * chunk_size:] += sums[-1, :len(out) - full_chunks * chunk_size]
+        return out
+    
+    @staticmethod
+    def to_stereo(wave, delay=0, out=None):
+        """Convert a float wave in [-1, 1] to int16 stereo, reusing wave as scratch
         
-        # Echo (delayed quieter hit)
+        The right channel is the left rotated by delay samples. The result is
+        written into out (an int16 array of shape (len(wave), 2)) if given.
+        """
+        if out is None:
+            stereo = np.empty((len(wave), 2), dtype=np.int16)
+        elif out.shape != (len(wave), 2) or out.dtype != np.int16:
+            raise ValueError(f"expected an int16 ({len(wave)}, 2) output buffer")
+        else:
+            stereo = out
+        np.multiply(wave, 32767, out=wave)
+        np.clip(wave, -32767, 32767, out=wave)
+        stereo[:, 0] = wave
+        if delay:
+            stereo[delay:, 1] = stereo[:-delay, 0]
+            stereo[:delay, 1] = stereo[-delay:, 0]
+        else:
+            stereo[:, 1] = stereo[:, 0]
+        return stereo
+
+# Sound Generator Class
+class SoundGenerator:
+    """Generate simple sound effects as int16 stereo sample arrays
+    
+    Use AudioCache.sound() to turn a generator into a pygame Sound. Effects
+    can also render into a caller's buffer: pass out, an int16 array of
+    shape (SoundGenerator.frames(generator), 2). NoteSynth still mixes the
+    effect into one full-length float64 wave first, which to_stereo() then
+    converts into out.
+    """
+    # Length of each effect, so its buffer can be allocated before rendering
+    SECONDS = {"coin_sound": 0.3, "move_sound": 0.08, "victory_sound": 0.6, "fall_sound": 0.4, "grab_sound": 0.25}
+    # Chunks rendered per NoteSynth batch; small batches keep an effect's peak memory low
+    BATCH = 16
+    
+    @staticmethod
+    def frames(generator):
+        """Number of samples the effect generator renders"""
+        return int(SAMPLE_RATE * SoundGenerator.SECONDS[generator.__name__])
+    
+    @staticmethod
+    def generate_tone(frequency, duration, volume=0.3):
+        """Generate a simple tone"""
+        n_samples = int(SAMPLE_RATE * duration)
+        fade_len = int(SAMPLE_RATE * 0.01)  # 10ms fade in/out
+        notes = NoteSynth.notes(freq=frequency, length=n_samples, amplitude=volume,
+                                attack=fade_len, release=fade_len)
+        return NoteSynth.to_stereo(NoteSynth.render(notes, np.zeros(n_samples)))
+    
+    @staticmethod
+    def coin_sound(out=None):
+        """Coin insertion sound - bright metallic clink with echo"""
+        n_samples = int(SAMPLE_RATE * SoundGenerator.SECONDS["coin_sound"])
         echo_start = int(n_samples * 0.15)
-        wave_echo = np.zeros(n_samples)
-        if echo_start < n_samples:
-            wave_echo[echo_start:] = wave1[:n_samples-echo_start] * 0.3
         
-        # Combine
-        wave = (wave1 + wave2 + wave_echo) * 0.4
-        
-        # Convert to 16-bit
-        wave = np.clip(wave * 32767, -32767, 32767).astype(np.int16)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
+        # Main hit (high frequency), second harmonic, and a delayed quieter echo
+        notes = NoteSynth.notes(
+            freq=[1200, 1800, 1200],
+            start=[0, 0, echo_start],
+            length=[n_samples, n_samples, n_samples - echo_start],
+            amplitude=[0.4, 0.5 * 0.4, 0.3 * 0.4],
+            decay=[15, 20, 15],
+        )
+        return NoteSynth.to_stereo(NoteSynth.render(notes, np.zeros(n_samples), batch_size=SoundGenerator.BATCH), out=out)
     
     @staticmethod
-    def move_sound():
+    def move_sound(out=None):
         """Claw movement sound - short motor whir with slight pitch variation"""
-        sample_rate = 22050
-        duration = 0.08
-        n_samples = int(sample_rate * duration)
-        
-        # Create motor-like sound with frequency modulation
-        t = np.linspace(0, duration, n_samples, False)
-        
-        # Base frequency with slight vibration
-        base_freq = 180
-        vibrato = 20 * np.sin(40 * t * 2 * np.pi)  # Fast vibration
-        freq = base_freq + vibrato
+        n_samples = int(SAMPLE_RATE * SoundGenerator.SECONDS["move_sound"])
         
-        # Generate wave
-        phase = np.cumsum(freq * 2 * np.pi / sample_rate)
-        wave = np.sin(phase)
-        
-        # Add harmonics for mechanical sound
-        wave += 0.3 * np.sin(2 * phase)  # Octave
-        wave += 0.2 * np.sin(3 * phase)  # Fifth
-        
-        # Quick fade in/out envelope
-        envelope = np.ones(n_samples)
-        fade_in = int(n_samples * 0.1)
-        fade_out = int(n_samples * 0.2)
-        envelope[:fade_in] = np.linspace(0, 1, fade_in)
-        envelope[-fade_out:] = np.linspace(1, 0, fade_out)
-        
-        wave = wave * envelope * 0.15
-        
-        # Convert to 16-bit
-        wave = np.clip(wave * 32767, -32767, 32767).astype(np.int16)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
+        # Motor-like sound: 180 Hz with fast vibrato, octave and fifth harmonics,
+        # quick fade in/out
+        notes = NoteSynth.notes(
+            freq=180, length=n_samples, amplitude=0.15,
+            vibrato_depth=20, vibrato_rate=40,
+            attack=int(n_samples * 0.1), release=int(n_samples * 0.2),
+        )
+        wave = NoteSynth.render(notes, np.zeros(n_samples), harmonics=((1, 1.0), (2, 0.3), (3, 0.2)),
+                                batch_size=SoundGenerator.BATCH)
+        return NoteSynth.to_stereo(wave, out=out)
     
     @staticmethod
-    def victory_sound():
+    def victory_sound(out=None):
         """Victory sound - happy ascending notes"""
-        sample_rate = 22050
-        duration = 0.6
-        n_samples = int(sample_rate * duration)
+        n_samples = int(SAMPLE_RATE * SoundGenerator.SECONDS["victory_sound"])
         
-        # Three ascending notes
-        freqs = [523, 659, 784]  # C, E, G
-        wave = np.zeros(n_samples)
-        
-        for i, freq in enumerate(freqs):
-            start = int(i * n_samples / 3)
-            end = int((i + 1) * n_samples / 3)
-            t = np.linspace(0, duration/3, end - start, False)
-            note = np.sin(freq * t * 2 * np.pi)
-            
-            # Add envelope
-            envelope = np.exp(-t * 3)  # Decay
-            wave[start:end] = note * envelope * 0.3
-        
-        # Convert to 16-bit
-        wave = (wave * 32767).astype(np.int16)
-        stereo_wave = np.column_stack((wave, wave))
-        
-        return pygame.sndarray.make_sound(stereo_wave)
+        # Three ascending notes (C, E, G), each decaying
+        bounds = (np.arange(4) * n_samples / 3).astype(int)
+        notes = NoteSynth.notes(freq=[523, 659, 784], start=bounds[:-1], length=np.diff(bounds),
+                                amplitude=0.3, decay=3)
+        return NoteSynth.to_stereo(NoteSynth.render(notes, np.zeros(n_samples), batch_size=SoundGenerator.BATCH), out=out)
     
     @staticmethod
-    def fall_sound():
+    def fall_sound(out=None):
         """Falling sound - descending pitch"""
-        sample_rate = 22050
-        duration = 0.4
-        n_samples = int(sample_rate * duration)
-        
-        # Descending frequency
-        t = np.linspace(0, duration, n_samples, False)
-        freq_start = 600
-        freq_end = 200
-        freq = np.linspace(freq_start, freq_end, n_samples)
-        
-        # Generate wave with changing frequency
-        phase = np.cumsum(freq * 2 * np.pi / sample_rate)
-        wave = np.sin(phase) * 0.3
-        
-        # Fade out
-        envelope = np.exp(-t * 2)
-        wave = wave * envelope
-        
-        # Convert to 16-bit
-        wave = (wave * 32767).astype(np.int16)
-        stereo_wave = np.column_stack((wave, wave))
+        n_samples = int(SAMPLE_RATE * SoundGenerator.SECONDS["fall_sound"])
         
-        return pygame.sndarray.make_sound(stereo_wave)
+        # Glide from 600 Hz down to 200 Hz while fading out
+        notes = NoteSynth.notes(freq=600, freq_end=200, length=n_samples, amplitude=0.3, decay=2)
+        return NoteSynth.to_stereo(NoteSynth.render(notes, np.zeros(n_samples), batch_size=SoundGenerator.BATCH), out=out)
     
     @staticmethod
-    def grab_sound():
+    def grab_sound(out=None):
         """Grab sound - positive chirp when catching a turtle"""
-        sample_rate = 22050
-        duration = 0.25
+        n_samples = int(SAMPLE_RATE * SoundGenerator.SECONDS["grab_sound"])
+        note1_end = int(n_samples * 0.4)
+        note2_start = int(n_samples * 0.3)
+        
+        # Two quick ascending notes (happy chirp), overlapping slightly,
+        # plus some harmonic richness
+        notes = NoteSynth.notes(
+            freq=[600, 800, 1200],
+            start=[0, note2_start, 0],
+            length=[note1_end, n_samples - note2_start, n_samples],
+            amplitude=[0.35, 0.35, 0.3 * 0.35],
+            decay=[8, 6, 10],
+        )
+        return NoteSynth.to_stereo(NoteSynth.render(notes, np.zeros(n_samples), batch_size=SoundGenerator.BATCH), out=out)
+    
+    @staticmethod
+    def lofi_music():
+        """Generate calm piano music - peaceful and cozy"""
+        sample_rate = SAMPLE_RATE
+        duration = 60.0  # 60 seconds loop
         n_samples = int(sample_rate * duration)
         
-        # Two quick ascending notes (happy chirp)
-        t = np.linspace(0, duration, n_samples, False)
+        # Simple, peaceful chord progression with countryside feel
+        bpm = 90  # Gentle walking tempo
+        beat_duration = 60.0 / bpm
+        beats_per_chord = 4
+        chord_duration = beat_duration * beats_per_chord
         
-        # First note (lower)
-        freq1 = 600
-        note1_end = int(n_samples * 0.4)
-        wave = np.zeros(n_samples)
-        wave[:note1_end] = np.sin(freq1 * t[:note1_end] * 2 * np.pi) * np.exp(-t[:note1_end] * 8)
+        # Simple major chord progression in C major (bright, happy, peaceful)
+        chords = np.array([
+            [261.63, 329.63, 392.00],  # C major (C-E-G)
+            [392.00, 493.88, 587.33],  # G major (G-B-D)
+            [440.00, 523.25, 659.25],  # Am (A-C-E)
+            [349.23, 440.00, 523.25],  # F major (F-A-C)
+            [261.63, 329.63, 392.00],  # C major (repeat)
+            [349.23, 440.00, 523.25],  # F major
+            [392.00, 493.88, 587.33],  # G major
+            [261.63, 329.63, 392.00],  # C major (home)
+        ])
         
-        # Second note (higher, overlapping slightly)
-        freq2 = 800
-        note2_start = int(n_samples * 0.3)
-        if note2_start < n_samples:
-            t2 = t[note2_start:] - t[note2_start]
-            wave[note2_start:] += np.sin(freq2 * t2 * 2 * np.pi) * np.exp(-t2 * 6)
+        # Gentle piano chords (Stardew style): quick attack, slow decay
+        n_chords = int(duration / chord_duration)
+        chord_index = np.arange(n_chords)
+        chord_freqs = chords[chord_index % len(chords)]
+        chord_starts = (chord_index * chord_duration * sample_rate).astype(np.int64)
+        chord_ends = np.minimum(((chord_index + 1) * chord_duration * sample_rate).astype(np.int64), n_samples)
+        chord_lengths = chord_ends - chord_starts
+        notes_per_chord = chords.shape[1]
+        chord_notes = NoteSynth.notes(
+            freq=chord_freqs.ravel(),
+            start=np.repeat(chord_starts, notes_per_chord),
+            length=np.repeat(chord_lengths, notes_per_chord),
+            amplitude=0.15, decay=1.2, attack=int(0.05 * sample_rate),
+        )
+        
+        # Simple bass line (root notes, lower octave)
+        bass_notes = NoteSynth.notes(freq=chord_freqs[:, 0] / 2, start=chord_starts, length=chord_lengths,
+                                     amplitude=0.2, decay=1.5)
+        
+        # Add simple, peaceful melody (Stardew Valley style - pentatonic scale)
+        # C major pentatonic: C, D, E, G, A
+        melody = np.array([
+            # Phrase 1: Gentle ascending
+            (523.25, 0, 2),      # C
+            (587.33, 2, 2),      # D
+            (659.25, 4, 2),      # E
+            (783.99, 6, 3),      # G (held)
+            
+            # Phrase 2: Answer
+            (880.00, 10, 2),     # A
+            (783.99, 12, 2),     # G
+            (659.25, 14, 3),     # E (held)
+            
+            # Phrase 3: Variation
+            (783.99, 18, 2),     # G
+            (659.25, 20, 1),     # E
+            (587.33, 21, 1),     # D
+            (523.25, 22, 3),     # C (held)
+            
+            # Phrase 4: Gentle ending
+            (587.33, 26, 2),     # D
+            (659.25, 28, 2),     # E
+            (523.25, 30, 4),     # C (final, held long)
+        ])
+        melody_starts = (melody[:, 1] * beat_duration * sample_rate).astype(np.int64)
+        melody_ends = np.minimum((melody_starts + melody[:, 2] * beat_duration * sample_rate).astype(np.int64), n_samples)
+        melody_notes = NoteSynth.notes(
+            freq=melody[:, 0], start=melody_starts, length=melody_ends - melody_starts,
+            amplitude=0.18, decay=1.8, attack=int(0.03 * sample_rate), attack_curve=0.5,
+        )
         
-        # Add some harmonic richness
-        wave += 0.3 * np.sin(1200 * t * 2 * np.pi) * np.exp(-t * 10)
+        # Gentle "nature" ambience (very subtle): soft white noise for
+        # air/wind feeling, low-passed so only low frequencies remain
+        ambience = np.random.RandomState(42).normal(0, 0.003, n_samples)
+        kernel_size = 20
+        wave = np.convolve(ambience, np.ones(kernel_size) / kernel_size, mode='same')
+        del ambience
         
-        # Overall volume
-        wave = wave * 0.35
+        # Render piano chords, bass and melody together on top of it
+        NoteSynth.render(np.concatenate([chord_notes, bass_notes, melody_notes]), wave,
+                         harmonics=NoteSynth.PIANO, sample_rate=sample_rate)
         
-        # Convert to 16-bit
-        wave = np.clip(wave * 32767, -32767, 32767).astype(np.int16)
-        stereo_wave = np.column_stack((wave, wave))
+        # Apply gentle EQ (slight low-pass for warmth, like Stardew Valley)
+        kernel_size = 5
+        wave = np.convolve(wave, np.ones(kernel_size) / kernel_size, mode='same')
+        
+        # Normalize
+        max_val = np.max(np.abs(wave))
+        if max_val > 0:
+            wave *= 0.4 / max_val
         
-        return pygame.sndarray.make_sound(stereo_wave)
+        # Create stereo (minimal difference for natural feel): very slight delay
+        return NoteSynth.to_stereo(wave, delay=5)
     
     @staticmethod
-    def lofi_music():
-        """Generate calm piano music - peaceful and cozy"""
+    def lofi_music_reference():
+        """Original per-note implementation of lofi_music()
+        
+        Kept as the baseline for --bench synth, which checks the vectorised
+        version against it for speed, memory and accuracy.
+        """
         sample_rate = 22050
         duration = 60.0  # 60 seconds loop
         n_samples = int(sample_rate * duration)
@@ -397,25 +730,638 @@ class SoundGenerator:
         right = np.roll(final_wave, 5)  # Very slight delay
         stereo_wave = np.column_stack((left, right))
         
-        return pygame.sndarray.make_sound(stereo_wave)
+        return stereo_wave
 
-class Turtle:
-    """A cute chubby pixel art turtle doll"""
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
+# Sound effects used by the game, by name
+SOUND_EFFECTS = {
+    'coin': SoundGenerator.coin_sound,
+    'move': SoundGenerator.move_sound,
+    'victory': SoundGenerator.victory_sound,
+    'fall': SoundGenerator.fall_sound,
+    'grab': SoundGenerator.grab_sound,
+}
+
+class VoicePool:
+    """Sound effects played on mixer channels reserved for each effect
+    
+    Every effect owns a fixed number of voices, so however often effects are
+    triggered the mixer never mixes more than sum(VOICES) of them. play()
+    ignores retriggers within an effect's cooldown and, when all its voices
+    are busy, steals the one that started first, counting the steal as
+    saturation. hold() loops an effect for as long as it is held, which is
+    how the claw's motor whir plays while a movement key is down.
+    """
+    VOICES = {'coin': 1, 'move': 1, 'victory': 1, 'fall': 1, 'grab': 2}
+    COOLDOWNS = {'coin': 0.05, 'move': 0.0, 'victory': 0.5, 'fall': 0.1, 'grab': 0.1}  # Seconds
+    
+    def __init__(self, sounds, first_channel=MUSIC_CHANNEL + 1, voices=VOICES, cooldowns=COOLDOWNS):
+        self.sounds = sounds
+        self.cooldowns = cooldowns
+        end = first_channel + sum(voices.values())
+        if pygame.mixer.get_num_channels() < end:
+            pygame.mixer.set_num_channels(end)
+        # Keep Sound.play() and music off the pool's channels (and those below them)
+        pygame.mixer.set_reserved(end)
+        
+        self.voices = {}
+        channel = first_channel
+        for name, count in voices.items():
+            self.voices[name] = [pygame.mixer.Channel(i) for i in range(channel, channel + count)]
+            channel += count
+        self.started = {name: [0.0] * count for name, count in voices.items()}
+        self.last_play = dict.fromkeys(voices, float("-inf"))
+        self.looping = dict.fromkeys(voices, False)
+        self.plays = dict.fromkeys(voices, 0)
+        self.cooled = dict.fromkeys(voices, 0)  # Retriggers ignored inside the cooldown
+        self.steals = dict.fromkeys(voices, 0)  # Plays that found every voice busy
+    
+    def play(self, name, loops=0):
+        now = time.perf_counter()
+        if now - self.last_play[name] < self.cooldowns[name]:
+            self.cooled[name] += 1
+            return
+        self.last_play[name] = now
+        channels = self.voices[name]
+        started = self.started[name]
+        for i, channel in enumerate(channels):
+            if not channel.get_busy():
+                break
+        else:
+            # Every voice is busy: cut off the oldest
+            self.steals[name] += 1
+            i = started.index(min(started))
+        started[i] = now
+        channels[i].play(self.sounds[name], loops=loops)
+        self.plays[name] += 1
+    
+    def hold(self, name, held):
+        """Loop name while held is true; called every frame, it only acts on changes"""
+        if held == self.looping[name]:
+            return
+        self.looping[name] = held
+        if held:
+            self.play(name, loops=-1)
+        else:
+            for channel in self.voices[name]:
+                channel.stop()
+    
+    def stop(self):
+        for name in self.voices:
+            self.looping[name] = False
+            for channel in self.voices[name]:
+                channel.stop()
+    
+    def report(self):
+        parts = [f"{name} {self.plays[name]} played/{self.cooled[name]} cooled/{self.steals[name]} stolen"
+                 for name in self.voices if self.plays[name] or self.cooled[name]]
+        return "Voices: " + (", ".join(parts) if parts else "nothing played")
+
+class MusicStream:
+    """Endless lo-fi piano music, synthesised one short block at a time
+    
+    Plays the lofi_music arrangement (chords, bass, pentatonic melody, soft
+    noise and the warm low-pass) as a stream fed to a mixer Channel queue.
+    Every 32-beat cycle repeats the chord progression but picks its melody
+    phrases with its own RNG, so the music never loops. Notes crossing a
+    block boundary carry on in the next block and both filters keep their
+    history between blocks, so blocks join without clicks. Memory stays at a
+    couple of blocks however long it plays.
+    """
+    BLOCK = 16384  # Samples per block (about 0.75 s), a multiple of NoteSynth's chunk size
+    GAIN = 0.55  # Fixed in place of lofi_music's whole-loop normalisation (peak about 0.4)
+    BPM = 90
+    CHORDS = (
+        (261.63, 329.63, 392.00),  # C major (C-E-G)
+        (392.00, 493.88, 587.33),  # G major (G-B-D)
+        (440.00, 523.25, 659.25),  # Am (A-C-E)
+        (349.23, 440.00, 523.25),  # F major (F-A-C)
+        (261.63, 329.63, 392.00),  # C major (repeat)
+        (349.23, 440.00, 523.25),  # F major
+        (392.00, 493.88, 587.33),  # G major
+        (261.63, 329.63, 392.00),  # C major (home)
+    )
+    BEATS_PER_CHORD = 4
+    # C major pentatonic phrases as (freq, beat, beats), and the beats they start on
+    PHRASES = (
+        ((523.25, 0, 2), (587.33, 2, 2), (659.25, 4, 2), (783.99, 6, 3)),  # Gentle ascending
+        ((880.00, 0, 2), (783.99, 2, 2), (659.25, 4, 3)),                  # Answer
+        ((783.99, 0, 2), (659.25, 2, 1), (587.33, 3, 1), (523.25, 4, 3)),  # Variation
+        ((587.33, 0, 2), (659.25, 2, 2), (523.25, 4, 4)),                  # Gentle ending
+    )
+    PHRASE_BEATS = (0, 10, 18, 26)
+    
+    def __init__(self, seed=None, sample_rate=SAMPLE_RATE, block=BLOCK):
+        self.rng = random.Random(seed)  # Melody phrase choices
+        self.noise = np.random.RandomState(42)  # Ambience
+        self.sample_rate = sample_rate
+        self.block = block
+        self.beat = int(round(60 / self.BPM * sample_rate))  # Samples per beat
+        self.cycle_length = len(self.CHORDS) * self.BEATS_PER_CHORD * self.beat
+        self.position = 0  # First sample of the next block
+        self.cycles = 0  # Cycles scheduled so far
+        self.notes = np.zeros(0, dtype=NoteSynth.FIELDS)  # Notes still to finish
+        self.noise_history = np.zeros(19)  # Filter inputs carried over from the last block
+        self.eq_history = np.zeros(4)
+        self.last_left = np.zeros(5, dtype=np.int16)  # Tail of the left channel for the right's delay
+        self.channel = None
+        self.thread = None
+        self.running = False
+    
+    def schedule_cycle(self):
+        """Append the notes of the next 32-beat cycle"""
+        beat = self.beat
+        chord_length = self.BEATS_PER_CHORD * beat
+        cycle_start = self.cycles * self.cycle_length
+        chord_starts = cycle_start + np.arange(len(self.CHORDS)) * chord_length
+        chord_freqs = np.array(self.CHORDS)
+        notes_per_chord = chord_freqs.shape[1]
+        
+        # Gentle piano chords: quick attack, slow decay; bass on the roots an octave down
+        chord_notes = NoteSynth.notes(
+            freq=chord_freqs.ravel(), start=np.repeat(chord_starts, notes_per_chord), length=chord_length,
+            amplitude=0.15, decay=1.2, attack=int(0.05 * self.sample_rate),
+        )
+        bass_notes = NoteSynth.notes(freq=chord_freqs[:, 0] / 2, start=chord_starts, length=chord_length,
+                                     amplitude=0.2, decay=1.5)
+        
+        # The first cycle plays the phrases in order; later ones vary the
+        # first three (or rest) and always resolve with the ending
+        if self.cycles == 0:
+            phrases = range(len(self.PHRASES))
+        else:
+            phrases = [self.rng.choice((0, 1, 2, 0, 1, 2, None)) for _ in range(3)] + [3]
+        melody = [(freq, phrase_beat + note_beat, beats)
+                  for phrase, phrase_beat in zip(phrases, self.PHRASE_BEATS) if phrase is not None
+                  for freq, note_beat, beats in self.PHRASES[phrase]]
+        melody = np.array(melody).reshape(-1, 3)
+        melody_notes = NoteSynth.notes(
+            freq=melody[:, 0], start=cycle_start + (melody[:, 1] * beat).astype(np.int64),
+            length=(melody[:, 2] * beat).astype(np.int64),
+            amplitude=0.18, decay=1.8, attack=int(0.03 * self.sample_rate), attack_curve=0.5,
+        )
+        
+        self.notes = np.concatenate([self.notes, chord_notes, bass_notes, melody_notes])
+        self.cycles += 1
+    
+    def next_block(self):
+        """Synthesise the next block as int16 stereo"""
+        start, size = self.position, self.block
+        while self.cycles * self.cycle_length < start + size:
+            self.schedule_cycle()
+        
+        # Soft low-passed noise for an air/wind feeling, continuing the last block's filter
+        noise = np.concatenate([self.noise_history, self.noise.normal(0, 0.003, size)])
+        self.noise_history = noise[-len(self.noise_history):]
+        wave = np.convolve(noise, np.ones(20) / 20, mode="valid")
+        
+        NoteSynth.render(self.notes, wave, harmonics=NoteSynth.PIANO, sample_rate=self.sample_rate, origin=start)
+        self.notes = self.notes[self.notes["start"] + self.notes["length"] > start + size]
+        
+        # Gentle EQ (slight low-pass for warmth), continuing the last block's filter
+        wave = np.concatenate([self.eq_history, wave])
+        self.eq_history = wave[-len(self.eq_history):]
+        wave = np.convolve(wave, np.ones(5) / 5, mode="valid")
+        
+        wave *= self.GAIN
+        np.multiply(wave, 32767, out=wave)
+        np.clip(wave, -32767, 32767, out=wave)
+        stereo = np.empty((size, 2), dtype=np.int16)
+        stereo[:, 0] = wave
+        
+        # Right channel is the left delayed by a few samples, across blocks too
+        delay = len(self.last_left)
+        stereo[:delay, 1] = self.last_left
+        stereo[delay:, 1] = stereo[:-delay, 0]
+        self.last_left = stereo[-delay:, 0].copy()
+        
+        self.position += size
+        return stereo
+    
+    def play(self, channel, volume=1.0):
+        """Start feeding blocks to channel from a background thread"""
+        self.channel = channel
+        channel.set_volume(volume)
+        self.running = True
+        self.thread = threading.Thread(target=self.feed, daemon=True)
+        self.thread.start()
+    
+    def feed(self):
+        # Keep one block queued behind the one playing; queue() plays at once if the channel is idle
+        poll = self.block / self.sample_rate / 4
+        while self.running:
+            if self.channel.get_queue() is None:
+                self.channel.queue(pygame.sndarray.make_sound(self.next_block()))
+            time.sleep(poll)
+    
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.channel is not None:
+            self.channel.stop()
+
+class AudioCache:
+    """Content-addressed on-disk cache of generated sample arrays
+    
+    Each generator's output is stored as raw interleaved int16 stereo in a
+    file named after a hash of the generator's name and arguments and of
+    this module file's size and modification time, so editing the game
+    invalidates every entry. Reading the source instead would cost more
+    than a warm start saves. Cached files are memory-mapped on load instead
+    of being synthesised again.
+    """
+    VERSION = 1
+    
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = os.environ.get("CLAW_MACHINE_CACHE") or os.path.join(
+                os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                "claw-machine", "audio")
+        self.directory = directory
+        self.keys = {}
+        self.stamp = None
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, generator, *args):
+        """Hash of everything that determines a generator's output"""
+        key = self.keys.get((generator, args))
+        if key is None:
+            description = repr((self.VERSION, generator.__name__, args, self.module_stamp()))
+            key = hashlib.sha256(description.encode("utf-8")).hexdigest()[:32]
+            self.keys[(generator, args)] = key
+        return key
+    
+    def module_stamp(self):
+        """Size and modification time of this file, looked up once per process"""
+        if self.stamp is None:
+            try:
+                info = os.stat(__file__)
+                self.stamp = (info.st_size, info.st_mtime_ns)
+            except (NameError, OSError):
+                self.stamp = ()
+        return self.stamp
+    
+    def path(self, generator, *args):
+        return os.path.join(self.directory, self.key(generator, *args) + ".pcm")
+    
+    def samples(self, generator, *args):
+        """Return the generator's int16 stereo samples, from disk when cached"""
+        path = self.path(generator, *args)
+        try:
+            samples = np.memmap(path, dtype=np.int16, mode="r").reshape(-1, 2)
+            self.hits += 1
+            return samples
+        except (OSError, ValueError):
+            pass
+        
+        self.misses += 1
+        samples = np.ascontiguousarray(generator(*args), dtype=np.int16)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary name first so readers never see a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            samples.tofile(temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not cache {generator.__name__}: {e}")
+        return samples
+    
+    def sound(self, generator, *args):
+        """Return a pygame Sound for the generator's output"""
+        return pygame.sndarray.make_sound(self.samples(generator, *args))
+
+# Shared by every Game; the directory can be overridden with CLAW_MACHINE_CACHE
+AUDIO_CACHE = AudioCache()
+
+class SampleBank:
+    """Every sound effect's int16 stereo samples in one named shared-memory block
+    
+    The first process to open a bank renders each effect into its slice of
+    the block. Each effect still goes through one full-length float64
+    temporary array, the NoteSynth mix, which is then converted into the
+    slice. Later processes attach to the block by name and map it, so the
+    effects are rendered once per host instead of once per game.
+    It saves rendering time, not memory: pygame.mixer.Sound copies the
+    samples it is given, so every process still holds its own copy of the
+    effects in the mixer. A table at the start of the block gives each
+    effect's slice, and its magic is written last, once the samples are in.
+    Samples are handed out as read-only numpy views.
+    """
+    MAGIC = b"CLAWBANK"
+    HEADER = struct.Struct("<8sH")  # magic, number of effects
+    ENTRY = struct.Struct("<16sQQ")  # effect name, byte offset, frames
+    ATTACH_TIMEOUT = 10.0  # Seconds to wait for another process to finish rendering
+    
+    def __init__(self, memory, owner):
+        self.memory = memory
+        self.owner = owner  # The creating process unlinks the block on close()
+        self.entries = {}
+        magic, count = self.HEADER.unpack_from(memory.buf)
+        for i in range(count):
+            name, offset, frames = self.ENTRY.unpack_from(memory.buf, self.HEADER.size + i * self.ENTRY.size)
+            self.entries[name.rstrip(b"\0").decode("ascii")] = (offset, frames)
+    
+    @classmethod
+    def create(cls, name=None, effects=SOUND_EFFECTS):
+        """Allocate a new block and render effects (a dict of generators) into it"""
+        table_size = cls.HEADER.size + len(effects) * cls.ENTRY.size
+        offset = -(-table_size // 16) * 16  # Keep the samples aligned
+        layout = {}
+        for effect, generator in effects.items():
+            frames = SoundGenerator.frames(generator)
+            layout[effect] = (offset, frames)
+            offset += frames * 4
+        memory = shared_memory.SharedMemory(name, create=True, size=offset)
+        try:
+            cls.HEADER.pack_into(memory.buf, 0, bytes(8), len(effects))
+            for i, (effect, (offset, frames)) in enumerate(layout.items()):
+                cls.ENTRY.pack_into(memory.buf, cls.HEADER.size + i * cls.ENTRY.size,
+                                    effect.encode("ascii"), offset, frames)
+                out = np.ndarray((frames, 2), dtype=np.int16, buffer=memory.buf, offset=offset)
+                effects[effect](out=out)
+                del out
+            cls.HEADER.pack_into(memory.buf, 0, cls.MAGIC, len(effects))
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+        return cls(memory, owner=True)
+    
+    @classmethod
+    def attach(cls, name):
+        """Map an existing bank, waiting for its creator to finish rendering"""
+        # The block belongs to its creator; keep this process's resource
+        # tracker from unlinking it when we exit
+        try:
+            memory = shared_memory.SharedMemory(name, track=False)  # Python 3.13+
+        except TypeError:
+            memory = shared_memory.SharedMemory(name)
+            resource_tracker.unregister(memory._name, "shared_memory")
+        deadline = time.perf_counter() + cls.ATTACH_TIMEOUT
+        while bytes(memory.buf[:len(cls.MAGIC)]) != cls.MAGIC:
+            if time.perf_counter() > deadline:
+                memory.close()
+                raise TimeoutError(f"sample bank {name} was never filled in")
+            time.sleep(0.01)
+        return cls(memory, owner=False)
+    
+    @classmethod
+    def open(cls, name):
+        """Attach to the bank called name, creating it if no process has yet"""
+        try:
+            return cls.create(name)
+        except FileExistsError:
+            return cls.attach(name)
+    
+    def samples(self, effect):
+        """Read-only view of an effect's samples inside the block"""
+        offset, frames = self.entries[effect]
+        samples = np.ndarray((frames, 2), dtype=np.int16, buffer=self.memory.buf, offset=offset)
+        samples.flags.writeable = False
+        return samples
+    
+    def sounds(self):
+        """A Sound for every effect; each is the mixer's own copy of the samples"""
+        return {effect: pygame.mixer.Sound(buffer=self.samples(effect)) for effect in self.entries}
+    
+    def close(self):
+        """Unmap the block (and remove it, in the creating process)
+        
+        Views from samples() must have been released first.
+        """
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+class DollStore:
+    """Doll state kept column-wise in numpy arrays, one slot per doll
+    
+    Turtle and Owl objects are thin views onto a slot, so per-doll memory is
+    a few array cells instead of an instance dict and a Rect, and gravity for
+    every falling doll is one vectorised step in fall().
+    
+    Falling dolls settle on the dolls below them, touching as circles of
+    DIAMETER, or stop at their original_y. Supports are found with a grid
+    broad phase in contacts(), so a step costs about the same per doll
+    however many dolls there are.
+    """
+    GRAVITY = 0.5
+    DIAMETER = 48  # Dolls collide as circles as wide as their sprites (2 * Doll.size)
+    COLUMN_SPAN = 1e7  # Sort-key distance between grid columns, beyond any y
+    BRUTE_FORCE_PAIRS = 4096  # Below this many doll pairs, skip the broad phase
+    
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.dolls = []  # View object for each slot
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.previous_x = np.zeros(capacity)  # Position before the last step, for drawing
+        self.previous_y = np.zeros(capacity)
+        self.fall_speed = np.zeros(capacity)  # Vertical speed when falling
+        self.original_y = np.zeros(capacity)  # Where a dropped doll comes to rest
+        self.caught = np.zeros(capacity, dtype=bool)
+        self.falling = np.zeros(capacity, dtype=bool)
+        self.at_rest = True  # No doll is falling, so fall() has nothing to do
+    
+    def __len__(self):
+        return self.count
+    
+    def allocate(self, doll, x, y):
+        """Give a new doll a slot and return its index"""
+        if self.count == len(self.x):
+            for name in ("x", "y", "previous_x", "previous_y", "fall_speed", "original_y", "caught", "falling"):
+                column = getattr(self, name)
+                grown = np.zeros(len(column) * 2, dtype=column.dtype)
+                grown[:self.count] = column
+                setattr(self, name, grown)
+        slot = self.count
+        self.count += 1
+        self.dolls.append(doll)
+        self.x[slot] = self.previous_x[slot] = x
+        self.y[slot] = self.previous_y[slot] = y
+        self.original_y[slot] = y
+        return slot
+    
+    def save(self):
+        """Remember the current positions as the previous step's"""
+        count = self.count
+        self.previous_x[:count] = self.x[:count]
+        self.previous_y[:count] = self.y[:count]
+    
+    def blend(self, alpha):
+        """Move every doll `alpha` of the way from its previous position
+        
+        Returns the real positions for restore().
+        """
+        count = self.count
+        current = self.x[:count].copy(), self.y[:count].copy()
+        for column, previous in ((self.x, self.previous_x), (self.y, self.previous_y)):
+            column[:count] += (previous[:count] - column[:count]) * (1 - alpha)
+        return current
+    
+    def restore(self, current):
+        count = self.count
+        self.x[:count], self.y[:count] = current
+    
+    def fall(self):
+        """Advance every falling doll by one frame
+        
+        Returns the slots of the dolls that moved and their y before the step.
+        """
+        if self.at_rest:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        count = self.count
+        falling = self.falling[:count]
+        moving = falling.nonzero()[0]
+        speed = self.fall_speed[moving] + self.GRAVITY
+        top = self.y[moving]
+        y = top + speed
+        
+        # Stop falling when reaching original position or below, or when
+        # touching a doll at rest
+        rest = self.original_y[moving]
+        x = self.x[moving]
+        support = np.flatnonzero(~(falling | self.caught[:count]))
+        if len(support):
+            np.minimum(rest, self.contacts(self.x[support], self.y[support], x, top, y), out=rest)
+        # Dolls landing this step support the others too. One may land on
+        # a doll that itself comes to rest higher up than first thought, so
+        # repeat until every resting place agrees with the dolls below it
+        landed = y >= rest
+        if landed.any() and len(moving) > 1:
+            floor = rest
+            for _ in range(len(moving)):
+                settled = np.minimum(floor, self.contacts(x[landed], rest[landed], x, top, y))
+                if np.array_equal(settled, rest):
+                    break
+                rest = settled
+                landed = y >= rest
+        y[landed] = rest[landed]
+        speed[landed] = 0
+        
+        self.y[moving] = y
+        self.fall_speed[moving] = speed
+        self.falling[moving[landed]] = False
+        self.at_rest = bool(landed.all())
+        return moving, top
+    
+    def contacts(self, support_x, support_y, x, top, bottom):
+        """First y, between top and bottom, at which each doll falling at x touches a support
+        
+        inf where it touches none. Supports are sorted into columns one
+        DIAMETER wide, keyed by column and then y, so each falling doll only
+        looks at the supports in its own and the two neighbouring columns
+        that lie within its fall. A few dolls are cheaper to test against
+        every support directly.
+        """
+        diameter = self.DIAMETER
+        if len(support_x) * len(x) <= self.BRUTE_FORCE_PAIRS:
+            reach = diameter ** 2 - (support_x - x[:, None]) ** 2
+            contact = support_y - np.sqrt(np.maximum(reach, 0))
+            touching = (reach > 0) & (contact >= top[:, None]) & (contact <= bottom[:, None])
+            return np.where(touching, contact, np.inf).min(axis=1)
+        
+        keys = np.floor(support_x / diameter) * self.COLUMN_SPAN + support_y
+        order = np.argsort(keys)
+        keys = keys[order]
+        column = np.floor(x / diameter)
+        
+        # Ranges of sorted supports in each neighbouring column that are
+        # within reach: a support at y touches from y - diameter to y
+        dolls = []
+        firsts = []
+        counts = []
+        for offset in (-1, 0, 1):
+            base = (column + offset) * self.COLUMN_SPAN
+            first = np.searchsorted(keys, base + top)
+            last = np.searchsorted(keys, base + bottom + diameter, side="right")
+            dolls.append(np.arange(len(x)))
+            firsts.append(first)
+            counts.append(last - first)
+        counts = np.concatenate(counts)
+        doll = np.repeat(np.concatenate(dolls), counts)
+        other = order[np.repeat(np.concatenate(firsts) - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+        
+        # Narrow phase: the height at which the two circles touch
+        dx = support_x[other] - x[doll]
+        touching = np.abs(dx) < diameter
+        contact = support_y[other] - np.sqrt(np.maximum(diameter ** 2 - dx ** 2, 0))
+        touching &= (contact >= top[doll]) & (contact <= bottom[doll])
+        first_contact = np.full(len(x), np.inf)
+        np.minimum.at(first_contact, doll[touching], contact[touching])
+        return first_contact
+    
+    def wake_above(self, slot):
+        """Start every doll resting on the one in slot, and those resting on them, falling again"""
+        count = self.count
+        x = self.x[:count]
+        y = self.y[:count]
+        loose = ~self.falling[:count] & ~self.caught[:count]
+        loose[slot] = False
+        below = np.array([slot])
+        while len(below):
+            dx = x[:, None] - x[below]
+            dy = y[below] - y[:, None]
+            # Touching (allowing for rounding) and higher up
+            resting = ((dy > 0) & (dx ** 2 + dy ** 2 <= (self.DIAMETER + 0.5) ** 2)).any(axis=1) & loose
+            below = resting.nonzero()[0]
+            loose[below] = False
+            self.falling[below] = True
+        if self.falling[:count].any():
+            self.at_rest = False
+
+def doll_field(name, kind):
+    """Property reading and writing one DollStore column at the doll's slot"""
+    def get(self):
+        return kind(getattr(self.store, name)[self.slot])
+    
+    def set(self, value):
+        getattr(self.store, name)[self.slot] = value
+    
+    return property(get, set)
+
+class Doll:
+    """State shared by every doll species, stored in a DollStore slot"""
+    __slots__ = ("store", "slot", "color")
+    size = 24
+    
+    x = doll_field("x", float)
+    y = doll_field("y", float)
+    fall_speed = doll_field("fall_speed", float)  # Vertical speed when falling
+    original_y = doll_field("original_y", float)  # Remember the original Y position
+    caught = doll_field("caught", bool)
+    
+    @property
+    def falling(self):
+        """Is the doll falling?"""
+        return bool(self.store.falling[self.slot])
+    
+    @falling.setter
+    def falling(self, value):
+        self.store.falling[self.slot] = value
+        if value:
+            self.store.at_rest = False
+    
+    def __init__(self, x, y, color, store=None):
+        self.store = store if store is not None else DollStore(capacity=1)
+        self.slot = self.store.allocate(self, x, y)
         self.color = color
-        self.size = 24
-        self.caught = False
-        self.falling = False  # Is the turtle falling?
-        self.fall_speed = 0  # Vertical speed when falling
-        self.original_y = y  # Remember the original Y position
-        self.rect = pygame.Rect(x - self.size, y - self.size, self.size * 2, self.size * 2)
+    
+    @property
+    def rect(self):
+        store, slot, size = self.store, self.slot, self.size
+        return pygame.Rect(float(store.x[slot]) - size, float(store.y[slot]) - size, size * 2, size * 2)
     
     def update(self):
-        """Update turtle position if falling"""
+        """Update this doll's position if falling
+        
+        Game advances all of its dolls at once with DollStore.fall(); this
+        is the same step for a single doll.
+        """
         if self.falling:
-            self.fall_speed += 0.5  # Gravity
+            self.fall_speed += DollStore.GRAVITY
             self.y += self.fall_speed
             
             # Stop falling when reaching original position or below
@@ -423,42 +1369,55 @@ class Turtle:
                 self.y = self.original_y
                 self.falling = False
                 self.fall_speed = 0
-            
-            self.update_rect()
     
     def draw(self, screen):
+        """Blit the pre-rendered sprite for this doll's color"""
+        SPRITES.blit(screen, self)
+    
+    def draw_primitives(self, screen):
+        """Draw the doll directly with pygame.draw calls (uncached)"""
+        self.render(screen, self.x, self.y, self.color, self.size)
+
+class Turtle(Doll):
+    """A cute chubby pixel art turtle doll"""
+    SPECIES = "turtle"
+    COLORS = TURTLE_COLORS
+    __slots__ = ()
+    
+    @staticmethod
+    def render(screen, x, y, color, size=24):
         # Draw a super round and chubby turtle!
-        shell_color = self.color
+        shell_color = color
         darker_shell = tuple(max(0, c - 50) for c in shell_color)
         light_shell = tuple(min(255, c + 30) for c in shell_color)
         
         # Chubby round shell (big circle!)
-        pygame.draw.circle(screen, shell_color, (self.x, self.y + 5), self.size)
-        pygame.draw.circle(screen, BLACK, (self.x, self.y + 5), self.size, 3)
+        pygame.draw.circle(screen, shell_color, (x, y + 5), size)
+        pygame.draw.circle(screen, BLACK, (x, y + 5), size, 3)
         
         # Shell pattern - cute hexagonal spots
         # Center large spot
-        pygame.draw.circle(screen, darker_shell, (self.x, self.y + 8), 10)
-        pygame.draw.circle(screen, BLACK, (self.x, self.y + 8), 10, 2)
+        pygame.draw.circle(screen, darker_shell, (x, y + 8), 10)
+        pygame.draw.circle(screen, BLACK, (x, y + 8), 10, 2)
         
         # Surrounding smaller spots (arranged in circle)
         spot_positions = [
-            (self.x - 12, self.y + 2),
-            (self.x + 12, self.y + 2),
-            (self.x - 10, self.y + 16),
-            (self.x + 10, self.y + 16),
+            (x - 12, y + 2),
+            (x + 12, y + 2),
+            (x - 10, y + 16),
+            (x + 10, y + 16),
         ]
         for spot_x, spot_y in spot_positions:
             pygame.draw.circle(screen, darker_shell, (spot_x, spot_y), 6)
             pygame.draw.circle(screen, BLACK, (spot_x, spot_y), 6, 1)
         
         # Highlight on shell (makes it look shiny and round)
-        pygame.draw.circle(screen, light_shell, (self.x - 6, self.y - 2), 8, 2)
+        pygame.draw.circle(screen, light_shell, (x - 6, y - 2), 8, 2)
         
         # Chubby head (bigger and rounder!)
         head_color = (180, 230, 180) if shell_color[1] > 150 else (220, 220, 180)
-        head_x = self.x
-        head_y = self.y - self.size + 8
+        head_x = x
+        head_y = y - size + 8
         pygame.draw.circle(screen, head_color, (head_x, head_y), 14)
         pygame.draw.circle(screen, BLACK, (head_x, head_y), 14, 2)
         
@@ -487,228 +1446,456 @@ class Turtle:
         # Stubby little legs (short and chubby!)
         leg_color = head_color
         # Front left
-        pygame.draw.ellipse(screen, leg_color, (self.x - self.size + 2, self.y + 18, 12, 10))
-        pygame.draw.ellipse(screen, BLACK, (self.x - self.size + 2, self.y + 18, 12, 10), 2)
+        pygame.draw.ellipse(screen, leg_color, (x - size + 2, y + 18, 12, 10))
+        pygame.draw.ellipse(screen, BLACK, (x - size + 2, y + 18, 12, 10), 2)
         
         # Front right
-        pygame.draw.ellipse(screen, leg_color, (self.x + self.size - 14, self.y + 18, 12, 10))
-        pygame.draw.ellipse(screen, BLACK, (self.x + self.size - 14, self.y + 18, 12, 10), 2)
+        pygame.draw.ellipse(screen, leg_color, (x + size - 14, y + 18, 12, 10))
+        pygame.draw.ellipse(screen, BLACK, (x + size - 14, y + 18, 12, 10), 2)
         
         # Back left
-        pygame.draw.ellipse(screen, leg_color, (self.x - self.size + 4, self.y + 24, 12, 8))
-        pygame.draw.ellipse(screen, BLACK, (self.x - self.size + 4, self.y + 24, 12, 8), 2)
+        pygame.draw.ellipse(screen, leg_color, (x - size + 4, y + 24, 12, 8))
+        pygame.draw.ellipse(screen, BLACK, (x - size + 4, y + 24, 12, 8), 2)
         
         # Back right
-        pygame.draw.ellipse(screen, leg_color, (self.x + self.size - 16, self.y + 24, 12, 8))
-        pygame.draw.ellipse(screen, BLACK, (self.x + self.size - 16, self.y + 24, 12, 8), 2)
+        pygame.draw.ellipse(screen, leg_color, (x + size - 16, y + 24, 12, 8))
+        pygame.draw.ellipse(screen, BLACK, (x + size - 16, y + 24, 12, 8), 2)
         
         # Tiny stubby tail
-        tail_x = self.x
-        tail_y = self.y + self.size + 4
+        tail_x = x
+        tail_y = y + size + 4
         pygame.draw.ellipse(screen, leg_color, (tail_x - 4, tail_y, 8, 6))
         pygame.draw.ellipse(screen, BLACK, (tail_x - 4, tail_y, 8, 6), 2)
-    
-    def update_rect(self):
-        self.rect = pygame.Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
 
-class Owl:
+class Owl(Doll):
     """A cute chubby pixel art owl doll"""
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = 24
-        self.caught = False
-        self.falling = False
-        self.fall_speed = 0
-        self.original_y = y
-        self.rect = pygame.Rect(x - self.size, y - self.size, self.size * 2, self.size * 2)
-    
-    def update(self):
-        """Update owl position if falling"""
-        if self.falling:
-            self.fall_speed += 0.5  # Gravity
-            self.y += self.fall_speed
-            
-            # Stop falling when reaching original position or below
-            if self.y >= self.original_y:
-                self.y = self.original_y
-                self.falling = False
-                self.fall_speed = 0
-            
-            self.update_rect()
+    SPECIES = "owl"
+    COLORS = OWL_COLORS
+    __slots__ = ()
     
-    def draw(self, screen):
+    @staticmethod
+    def render(screen, x, y, color, size=24):
         # Draw a super cute, round, chubby owl!
-        body_color = self.color
+        body_color = color
         darker_color = tuple(max(0, c - 40) for c in body_color)
         lighter_color = tuple(min(255, c + 50) for c in body_color)
         
         # Main body - BIG round circle (super chubby!)
-        pygame.draw.circle(screen, body_color, (self.x, self.y + 2), 22)
-        pygame.draw.circle(screen, BLACK, (self.x, self.y + 2), 22, 3)
+        pygame.draw.circle(screen, body_color, (x, y + 2), 22)
+        pygame.draw.circle(screen, BLACK, (x, y + 2), 22, 3)
         
         # Belly patch (lighter, smaller circle on body)
-        pygame.draw.circle(screen, lighter_color, (self.x, self.y + 8), 12)
-        pygame.draw.circle(screen, BLACK, (self.x, self.y + 8), 12, 2)
+        pygame.draw.circle(screen, lighter_color, (x, y + 8), 12)
+        pygame.draw.circle(screen, BLACK, (x, y + 8), 12, 2)
         
         # Head - large overlapping circle (merged with body for round look)
-        pygame.draw.circle(screen, body_color, (self.x, self.y - 10), 18)
-        pygame.draw.circle(screen, BLACK, (self.x, self.y - 10), 18, 3)
+        pygame.draw.circle(screen, body_color, (x, y - 10), 18)
+        pygame.draw.circle(screen, BLACK, (x, y - 10), 18, 3)
         
         # Cute round ear tufts (small circles instead of triangles)
         # Left tuft
-        pygame.draw.circle(screen, darker_color, (self.x - 10, self.y - 22), 5)
-        pygame.draw.circle(screen, BLACK, (self.x - 10, self.y - 22), 5, 2)
+        pygame.draw.circle(screen, darker_color, (x - 10, y - 22), 5)
+        pygame.draw.circle(screen, BLACK, (x - 10, y - 22), 5, 2)
         
         # Right tuft  
-        pygame.draw.circle(screen, darker_color, (self.x + 10, self.y - 22), 5)
-        pygame.draw.circle(screen, BLACK, (self.x + 10, self.y - 22), 5, 2)
+        pygame.draw.circle(screen, darker_color, (x + 10, y - 22), 5)
+        pygame.draw.circle(screen, BLACK, (x + 10, y - 22), 5, 2)
         
         # Stubby round wings (small ovals on sides)
         # Left wing
-        left_wing_rect = pygame.Rect(self.x - 24, self.y - 2, 10, 16)
+        left_wing_rect = pygame.Rect(x - 24, y - 2, 10, 16)
         pygame.draw.ellipse(screen, darker_color, left_wing_rect)
         pygame.draw.ellipse(screen, BLACK, left_wing_rect, 2)
         
         # Right wing
-        right_wing_rect = pygame.Rect(self.x + 14, self.y - 2, 10, 16)
+        right_wing_rect = pygame.Rect(x + 14, y - 2, 10, 16)
         pygame.draw.ellipse(screen, darker_color, right_wing_rect)
         pygame.draw.ellipse(screen, BLACK, right_wing_rect, 2)
         
         # HUGE adorable eyes (signature owl feature - make them BIG!)
         # Left eye - white circle
-        pygame.draw.circle(screen, WHITE, (self.x - 8, self.y - 12), 9)
-        pygame.draw.circle(screen, BLACK, (self.x - 8, self.y - 12), 9, 2)
+        pygame.draw.circle(screen, WHITE, (x - 8, y - 12), 9)
+        pygame.draw.circle(screen, BLACK, (x - 8, y - 12), 9, 2)
         # Pupil
-        pygame.draw.circle(screen, BLACK, (self.x - 8, self.y - 11), 6)
+        pygame.draw.circle(screen, BLACK, (x - 8, y - 11), 6)
         # Sparkle
-        pygame.draw.circle(screen, WHITE, (self.x - 6, self.y - 13), 2)
+        pygame.draw.circle(screen, WHITE, (x - 6, y - 13), 2)
         
         # Right eye - white circle
-        pygame.draw.circle(screen, WHITE, (self.x + 8, self.y - 12), 9)
-        pygame.draw.circle(screen, BLACK, (self.x + 8, self.y - 12), 9, 2)
+        pygame.draw.circle(screen, WHITE, (x + 8, y - 12), 9)
+        pygame.draw.circle(screen, BLACK, (x + 8, y - 12), 9, 2)
         # Pupil
-        pygame.draw.circle(screen, BLACK, (self.x + 8, self.y - 11), 6)
+        pygame.draw.circle(screen, BLACK, (x + 8, y - 11), 6)
         # Sparkle
-        pygame.draw.circle(screen, WHITE, (self.x + 10, self.y - 13), 2)
+        pygame.draw.circle(screen, WHITE, (x + 10, y - 13), 2)
         
         # Tiny cute beak (small rounded triangle)
         beak_color = (255, 180, 80)
-        beak = [(self.x, self.y - 5), (self.x - 3, self.y - 1), (self.x + 3, self.y - 1)]
+        beak = [(x, y - 5), (x - 3, y - 1), (x + 3, y - 1)]
         pygame.draw.polygon(screen, beak_color, beak)
         pygame.draw.polygon(screen, BLACK, beak, 2)
         
         # Pink blush cheeks (like the turtle!)
         blush_color = (255, 180, 200)
         # Left cheek
-        pygame.draw.circle(screen, blush_color, (self.x - 16, self.y - 8), 4)
+        pygame.draw.circle(screen, blush_color, (x - 16, y - 8), 4)
         # Right cheek
-        pygame.draw.circle(screen, blush_color, (self.x + 16, self.y - 8), 4)
+        pygame.draw.circle(screen, blush_color, (x + 16, y - 8), 4)
         
         # Tiny round feet at bottom (cute stubby feet)
         feet_color = (255, 200, 120)
         # Left foot
-        pygame.draw.circle(screen, feet_color, (self.x - 8, self.y + 22), 4)
-        pygame.draw.circle(screen, BLACK, (self.x - 8, self.y + 22), 4, 2)
+        pygame.draw.circle(screen, feet_color, (x - 8, y + 22), 4)
+        pygame.draw.circle(screen, BLACK, (x - 8, y + 22), 4, 2)
         
         # Right foot
-        pygame.draw.circle(screen, feet_color, (self.x + 8, self.y + 22), 4)
-        pygame.draw.circle(screen, BLACK, (self.x + 8, self.y + 22), 4, 2)
-    
-    def update_rect(self):
-        self.rect = pygame.Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
+        pygame.draw.circle(screen, feet_color, (x + 8, y + 22), 4)
+        pygame.draw.circle(screen, BLACK, (x + 8, y + 22), 4, 2)
 
-class Claw:
-    """The claw mechanism in pixel art style"""
+# Every doll species. Snapshots, layouts and grab logs store a species as its
+# index here, so new species go at the end.
+SPECIES = (Turtle, Owl)
+
+class SpriteCache:
+    """Pre-rendered doll sprites, one alpha Surface per (species, color)"""
+    # Sprite surface size and where the doll's (x, y) lands inside it.
+    # Large enough for the turtle's head (y - 30) and tail (y + 34).
+    WIDTH = 72
+    HEIGHT = 80
+    ANCHOR_X = 36
+    ANCHOR_Y = 40
+    
+    def __init__(self):
+        self.sprites = {}
+        self.offsets = {}  # Top-left of each cropped sprite relative to the doll's (x, y)
+    
+    def build(self, doll_classes=None):
+        """Render every palette color of every doll species up front"""
+        for doll_class in doll_classes or SPECIES:
+            for color in doll_class.COLORS:
+                self.get(doll_class, color)
+    
+    def get(self, doll_class, color):
+        """Return the sprite for a species/color, rendering it on first use"""
+        key = (doll_class.SPECIES, tuple(color))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            canvas = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
+            doll_class.render(canvas, self.ANCHOR_X, self.ANCHOR_Y, color)
+            
+            # Crop to the visible pixels so blits and dirty rects stay small
+            bounds = canvas.get_bounding_rect()
+            sprite = canvas.subsurface(bounds).copy()
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self.sprites[key] = sprite
+            self.offsets[key] = (bounds.x - self.ANCHOR_X, bounds.y - self.ANCHOR_Y)
+        return sprite
+    
+    def rect(self, doll):
+        """Screen area covered by a doll's sprite"""
+        sprite = self.get(type(doll), doll.color)
+        dx, dy = self.offsets[(doll.SPECIES, tuple(doll.color))]
+        return sprite.get_rect(topleft=(int(doll.x) + dx, int(doll.y) + dy))
+    
+    def blit(self, screen, doll):
+        """Draw a doll with a single blit"""
+        sprite = self.get(type(doll), doll.color)
+        dx, dy = self.offsets[(doll.SPECIES, tuple(doll.color))]
+        return screen.blit(sprite, (int(doll.x) + dx, int(doll.y) + dy))
+    
+    def verify(self, background=LIGHT_BLUE):
+        """Compare cached sprites with primitive rendering pixel for pixel
+        
+        Returns a list of (species, color) keys whose output differs.
+        """
+        mismatches = []
+        for doll_class in SPECIES:
+            for color in doll_class.COLORS:
+                doll = doll_class(self.WIDTH, self.HEIGHT, color)
+                size = (self.WIDTH * 2, self.HEIGHT * 2)
+                
+                expected = pygame.Surface(size)
+                expected.fill(background)
+                doll.draw_primitives(expected)
+                
+                actual = pygame.Surface(size)
+                actual.fill(background)
+                self.blit(actual, doll)
+                
+                if pygame.image.tobytes(expected, "RGB") != pygame.image.tobytes(actual, "RGB"):
+                    mismatches.append((doll_class.SPECIES, tuple(color)))
+        return mismatches
+
+# Shared by every doll; filled in by Game.__init__
+SPRITES = SpriteCache()
+
+class DollIndex:
+    """Uniform grid over doll rects for fast overlap queries
+    
+    Each doll is listed in every grid cell its rect touches, so a query only
+    looks at dolls near the query rect instead of scanning all of them. Call
+    move() whenever a doll's rect changes, or move_fallen() for the dolls a
+    DollStore.fall() step moved, and remove() when it leaves the machine. query() returns dolls in the order they were added, which
+    matches the order of Game.turtles.
+    """
+    CELL_SIZE = 64
+    
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}    # (column, row) -> {doll: serial}
+        self.entries = {}  # doll -> (serial, cells it is listed in)
+        self.next_serial = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def cells_for(self, rect):
+        size = self.cell_size
+        left, top, width, height = rect
+        first_column, last_column = left // size, (left + width - 1) // size
+        first_row, last_row = top // size, (top + height - 1) // size
+        if first_column == last_column and first_row == last_row:
+            return ((first_column, first_row),)
+        return tuple([(column, row)
+                      for column in range(first_column, last_column + 1)
+                      for row in range(first_row, last_row + 1)])
+    
+    def move_fallen(self, store, slots, previous_y):
+        """Re-bucket the dolls in store slots that moved only vertically, from previous_y
+        
+        Which dolls may have a rect edge crossing into another grid row is
+        worked out for all of them at once, allowing a pixel either way for
+        how Rect rounds. Only those go through move(), so a frame of falling
+        dolls costs a few numpy operations plus the few that changed rows.
+        """
+        y = store.y[slots]
+        low = np.minimum(previous_y, y)
+        high = np.maximum(previous_y, y)
+        size = self.cell_size
+        crossed = np.zeros(len(slots), dtype=bool)
+        for edge in (-Doll.size, Doll.size - 1):  # Top and bottom pixel rows of the rect
+            crossed |= (high + edge + 1) // size != (low + edge - 1) // size
+        dolls = store.dolls
+        for slot in slots[crossed]:
+            self.move(dolls[slot])
+    
+    def add(self, doll):
+        serial = self.next_serial
+        self.next_serial += 1
+        cells = self.cells_for(doll.rect)
+        for cell in cells:
+            self.cells.setdefault(cell, {})[doll] = serial
+        self.entries[doll] = (serial, cells)
+    
+    def remove(self, doll):
+        serial, cells = self.entries.pop(doll)
+        for cell in cells:
+            bucket = self.cells[cell]
+            del bucket[doll]
+            if not bucket:
+                del self.cells[cell]
+    
+    def move(self, doll):
+        """Re-bucket a doll after its rect changed"""
+        serial, old_cells = self.entries[doll]
+        cells = self.cells_for(doll.rect)
+        if cells == old_cells:
+            return
+        for cell in old_cells:
+            bucket = self.cells[cell]
+            del bucket[doll]
+            if not bucket:
+                del self.cells[cell]
+        for cell in cells:
+            self.cells.setdefault(cell, {})[doll] = serial
+        self.entries[doll] = (serial, cells)
+    
+    def query(self, rect):
+        """Dolls whose rect overlaps rect, in the order they were added"""
+        cells = self.cells
+        found = {}
+        for cell in self.cells_for(rect):
+            bucket = cells.get(cell)
+            if bucket:
+                for doll, serial in bucket.items():
+                    if rect.colliderect(doll.rect):
+                        found[doll] = serial
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=found.get)
+
+class ClawState(enum.IntEnum):
+    """Phases of a claw drop, in the order they happen"""
+    MOVING = 0
+    DESCENDING = 1
+    CLOSING = 2
+    ASCENDING = 3
+
+class ClawTrigger(enum.IntEnum):
+    """What moves the claw from one state to the next"""
+    DROP = 0   # SPACE while aiming
+    CLOSE = 1  # SPACE while descending, or hitting the bottom
+    LIFT = 2   # The closing pause is over
+    HOME = 3   # The rope is fully wound in
+    RESET = 4  # Time ran out
+
+class ClawEventKind(enum.IntEnum):
+    GRAB = 0     # A doll was caught as the claw closed
+    SLIP = 1     # The caught doll slipped out on the way up
+    SUCCESS = 2  # The claw got home holding a doll
+    MISS = 3     # The claw got home empty
+
+# Something a claw drop did, with the doll involved (None for MISS)
+ClawEvent = namedtuple("ClawEvent", ["kind", "doll"])
+
+class ClawTimings:
+    """Claw hook recording how many update frames each visit to a state lasted"""
     def __init__(self):
+        self.frames = {state: [] for state in ClawState}
+    
+    def __call__(self, state, next_state, frames):
+        self.frames[state].append(frames)
+    
+    def report(self):
+        lines = [f"{'claw state':<12}{'visits':>9}{'mean':>8}{'p50':>6}{'p95':>6}{'max':>6}  (frames)"]
+        for state, frames in self.frames.items():
+            if not frames:
+                continue
+            frames = sorted(frames)
+            lines.append(f"{state.name.lower():<12}{len(frames):>9}{sum(frames) / len(frames):>8.1f}"
+                         f"{frames[len(frames) // 2]:>6}{frames[len(frames) * 95 // 100]:>6}{frames[-1]:>6}")
+        return "\n".join(lines)
+
+class Claw:
+    """The claw mechanism in pixel art style
+    
+    A state machine: fire() looks up (state, trigger) in TRANSITIONS to get
+    the next state and the action run on the way, and update() dispatches to
+    the current state's handler in UPDATES. Each hook is called as
+    hook(state, next_state, frames) on every transition, with the number of
+    update frames spent in the state being left.
+    """
+    def __init__(self, rng=random, hooks=()):
+        self.rng = rng  # Source of the slip roll
+        self.hooks = hooks
         self.x = SCREEN_WIDTH // 2
         self.y = 100
         self.rope_length = 0
         self.max_rope = 370  # Increased to reach all turtles
         self.speed = 3
-        self.state = "moving"  # moving, descending, closing, ascending
+        self.state = ClawState.MOVING
+        self.state_frames = 0  # Frames updated in the current state
         self.grabbed_turtle = None
         self.is_closing = False
         self.fall_check_done = False  # Track if we've checked for fall
-        self.ascend_frames = 0  # Count frames while ascending
+    
+    def fire(self, trigger):
+        """Take the transition for trigger, if the current state has one"""
+        transition = self.TRANSITIONS.get((self.state, trigger))
+        if transition is None:
+            return False
+        next_state, action = transition
+        for hook in self.hooks:
+            hook(self.state, next_state, self.state_frames)
+        self.state = next_state
+        self.state_frames = 0
+        if action is not None:
+            action(self)
+        return True
     
     def move_left(self):
-        if self.state == "moving" and self.x > 150:
+        if self.state == ClawState.MOVING and self.x > 150:
             self.x -= self.speed
     
     def move_right(self):
-        if self.state == "moving" and self.x < SCREEN_WIDTH - 150:
+        if self.state == ClawState.MOVING and self.x < SCREEN_WIDTH - 150:
             self.x += self.speed
     
     def start_descend(self):
         """Start descending when SPACE is pressed"""
-        if self.state == "moving":
-            self.state = "descending"
-            self.is_closing = False
-            return True
-        return False
+        return self.fire(ClawTrigger.DROP)
     
     def close_claw(self):
         """Close the claw to grab when SPACE is pressed during descent"""
-        if self.state == "descending":
-            self.state = "closing"
-            self.is_closing = True
-            return True
-        return False
+        return self.fire(ClawTrigger.CLOSE)
+    
+    def reset(self):
+        """Abandon the drop and return to aiming, as when time runs out"""
+        self.fire(ClawTrigger.RESET)
+        self.rope_length = 0
+    
+    def grab(self, doll):
+        doll.caught = True
+        self.grabbed_turtle = doll
+        return ClawEvent(ClawEventKind.GRAB, doll)
+    
+    def open(self):
+        self.is_closing = False
+    
+    def shut(self):
+        self.is_closing = True
+    
+    def lift(self):
+        self.fall_check_done = False  # Reset for new ascent
+    
+    def home(self):
+        self.is_closing = False
+        self.fall_check_done = False  # Reset for next round
     
     def update(self):
-        if self.state == "descending":
-            self.rope_length += 4
-            if self.rope_length >= self.max_rope:
-                self.rope_length = self.max_rope
-                # Auto close if reached bottom
-                self.state = "closing"
-                self.is_closing = True
-        
-        elif self.state == "closing":
-            # Claw is closing, brief pause then ascend
-            self.state = "ascending"
-            self.fall_check_done = False  # Reset for new ascent
-            self.ascend_frames = 0  # Reset frame counter
-        
-        elif self.state == "ascending":
-            self.rope_length -= 3
-            self.ascend_frames += 1  # Count frames while ascending
-            
-            # Check for fall (60% chance) when halfway up, but after 30 frames delay
-            if self.grabbed_turtle and not self.fall_check_done and self.rope_length <= self.max_rope // 2 and self.ascend_frames >= 30:
-                self.fall_check_done = True
-                if random.random() < 0.6:  # 60% chance to fall
-                    # Turtle falls back down!
-                    self.grabbed_turtle.caught = False
-                    self.grabbed_turtle.falling = True  # Start falling animation
-                    self.grabbed_turtle.fall_speed = 0  # Reset fall speed
-                    self.grabbed_turtle = None
-                    return "fall"  # Signal that turtle fell
-            
-            if self.rope_length <= 0:
-                self.rope_length = 0
-                self.state = "moving"
-                self.is_closing = False
-                self.fall_check_done = False  # Reset for next round
-                self.ascend_frames = 0  # Reset frame counter
-                if self.grabbed_turtle:
-                    return True  # Successfully caught!
-                else:
-                    return False  # Failed
+        """Advance one frame, returning a ClawEvent when the drop produces one"""
+        self.state_frames += 1
+        event = self.UPDATES[self.state](self)
         
         # Update grabbed turtle position
         if self.grabbed_turtle:
             self.grabbed_turtle.x = self.x
             self.grabbed_turtle.y = self.y + self.rope_length + 30
-            self.grabbed_turtle.update_rect()
+        return event
+    
+    def update_moving(self):
+        return None
+    
+    def update_descending(self):
+        self.rope_length += 4
+        if self.rope_length >= self.max_rope:
+            self.rope_length = self.max_rope
+            # Auto close if reached bottom
+            self.fire(ClawTrigger.CLOSE)
+        return None
+    
+    def update_closing(self):
+        # Claw is closing, brief pause then ascend
+        self.fire(ClawTrigger.LIFT)
+        return None
+    
+    def update_ascending(self):
+        self.rope_length -= 3
         
+        # Check for fall (60% chance) when halfway up, but after 30 frames delay
+        doll = self.grabbed_turtle
+        if doll and not self.fall_check_done and self.rope_length <= self.max_rope // 2 and self.state_frames >= 30:
+            self.fall_check_done = True
+            if self.rng.random() < 0.6:  # 60% chance to fall
+                self.grabbed_turtle = None
+                return ClawEvent(ClawEventKind.SLIP, doll)
+        
+        if self.rope_length <= 0:
+            self.rope_length = 0
+            self.fire(ClawTrigger.HOME)
+            if doll:
+                return ClawEvent(ClawEventKind.SUCCESS, doll)
+            return ClawEvent(ClawEventKind.MISS, None)
         return None
     
     def get_claw_pos(self):
         return self.x, self.y + self.rope_length
     
+    def get_rect(self):
+        """Screen area covered by the rope and claw"""
+        return pygame.Rect(self.x - 22, self.y, 44, self.rope_length + 36)
+    
     def draw(self, screen):
         # Rope/cable (pixel style - dashed line)
         rope_y = self.y
@@ -727,7 +1914,7 @@ class Claw:
         claw_y = claw_top_y + 12
         claw_bottom = claw_top_y + 30
         
-        if self.state in ["moving", "descending"] and not self.is_closing:
+        if self.state <= ClawState.DESCENDING and not self.is_closing:
             # Open claw (wide)
             # Left arm
             pygame.draw.rect(screen, YELLOW, (self.x - 20, claw_y, 6, 18))
@@ -754,17 +1941,1081 @@ class Claw:
             pygame.draw.rect(screen, GOLD, (self.x + 4, claw_bottom, 8, 6))
             pygame.draw.rect(screen, BLACK, (self.x + 4, claw_bottom, 8, 6), 1)
 
+Claw.TRANSITIONS = {
+    (ClawState.MOVING, ClawTrigger.DROP): (ClawState.DESCENDING, Claw.open),
+    (ClawState.DESCENDING, ClawTrigger.CLOSE): (ClawState.CLOSING, Claw.shut),
+    (ClawState.CLOSING, ClawTrigger.LIFT): (ClawState.ASCENDING, Claw.lift),
+    (ClawState.ASCENDING, ClawTrigger.HOME): (ClawState.MOVING, Claw.home),
+    # Time running out abandons a drop from any state, keeping the claw's flags as they are
+    **{(state, ClawTrigger.RESET): (ClawState.MOVING, None) for state in ClawState},
+}
+# Per-frame handlers, indexed by ClawState
+Claw.UPDATES = (Claw.update_moving, Claw.update_descending, Claw.update_closing, Claw.update_ascending)
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)
+    
+    HUD strings only change a few times per round, so most frames can reuse
+    the surface rendered the first time instead of rasterising it again.
+    """
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, font, text, color):
+        """Return an antialiased text surface, rendering it only on a miss"""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # Drop the least recently used
+        return surface
+    
+    def clear(self):
+        self.surfaces.clear()
+    
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+    
+    def report(self):
+        return (f"Text cache: {self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate():.1%} hit rate, {len(self.surfaces)} cached)")
+
+# Shared by every HUD render path in Game.draw
+TEXT_CACHE = TextCache()
+
+class LayeredRenderer:
+    """Draws dynamic items over a cached static background with dirty-rect updates
+    
+    Every frame the game adds its dynamic items (dolls, claw, HUD) in draw
+    order, each with the screen rect it covers and a signature describing its
+    look. Only items whose rect or signature changed, plus anything they
+    overlap, are redrawn, and only those areas are sent to the display.
+    """
+    def __init__(self, screen, background, display=True):
+        self.screen = screen
+        self.background = background
+        self.display = display  # Whether screen is the window, to be updated after drawing
+        self.items = []
+        self.previous = {}  # key -> (rect, signature) drawn last frame
+        self.full_redraw = True
+        self.draw_calls = 0  # Blits and item draws done by the last present()
+        self.profiler = None  # FrameProfiler timing the draw and display phases
+    
+    def invalidate(self):
+        """Redraw the whole screen on the next present()"""
+        self.full_redraw = True
+    
+    def begin(self):
+        self.items = []
+    
+    def add(self, key, rect, signature, draw_fn, *args):
+        """Queue an item; draw_fn(screen, *args) is called only if it needs redrawing"""
+        self.items.append((key, rect, signature, draw_fn, args))
+    
+    def present(self):
+        """Redraw the changed areas and update them on the display
+        
+        Returns the list of rects that were updated.
+        """
+        screen = self.screen
+        items = self.items
+        
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            for key, rect, signature, draw_fn, args in items:
+                draw_fn(screen, *args)
+            dirty = [screen.get_rect()]
+            self.full_redraw = False
+            self.draw_calls = 1 + len(items)
+        else:
+            dirty = []
+            seen = set()
+            for key, rect, signature, draw_fn, args in items:
+                seen.add(key)
+                last = self.previous.get(key)
+                if last is None:
+                    dirty.append(rect)
+                elif last[1] != signature or last[0] != rect:
+                    dirty.append(last[0])
+                    dirty.append(rect)
+            for key, (rect, signature) in self.previous.items():
+                if key not in seen:
+                    dirty.append(rect)
+            
+            # An item overlapping a dirty area is redrawn in full, which makes its
+            # own area dirty too; repeat until no new items are pulled in
+            redraw = [False] * len(items)
+            grew = bool(dirty)
+            while grew:
+                grew = False
+                for i, item in enumerate(items):
+                    if not redraw[i] and item[1].collidelist(dirty) != -1:
+                        redraw[i] = True
+                        dirty.append(item[1])
+                        grew = True
+            
+            for rect in dirty:
+                screen.blit(self.background, rect, rect)
+            for i, (key, rect, signature, draw_fn, args) in enumerate(items):
+                if redraw[i]:
+                    draw_fn(screen, *args)
+            self.draw_calls = len(dirty) + sum(redraw)
+        
+        self.previous = {key: (rect, signature) for key, rect, signature, draw_fn, args in items}
+        if self.profiler is not None:
+            self.profiler.mark("draw")
+        if dirty and self.display:
+            pygame.display.update(dirty)
+        return dirty
+
+class TextureRenderer:
+    """LayeredRenderer's interface, drawn with pygame._sdl2 textures on an SDL Renderer
+    
+    The background, every doll sprite and the claw's rope and body are
+    uploaded as textures once, and each frame is rebuilt from scratch with
+    texture copies only. Items without a copy method (the HUD) are drawn by
+    their draw_fn into a scratch Surface and uploaded when their signature
+    changes; the last CACHE_SIZE of those textures are kept. Use open() to
+    get an SDL Renderer, which fails when there is none of the wanted kind.
+    """
+    CACHE_SIZE = 64
+    
+    def __init__(self, renderer, background, display=True):
+        self.renderer = renderer
+        self.display = display  # Whether to present each frame to the window
+        self.background = sdl2_video.Texture.from_surface(renderer, background)
+        self.scratch = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.sprites = {}  # SpriteCache key -> Texture
+        self.claw_parts = {}  # Claw look -> Texture
+        self.textures = OrderedDict()  # (key, signature) -> Texture of a drawn item
+        self.items = []
+        self.draw_calls = 0  # Texture copies done by the last present()
+        self.uploads = 0  # Textures created since the renderer was made
+        self.profiler = None  # FrameProfiler timing the draw and display phases
+    
+    @staticmethod
+    def open(title, size=(SCREEN_WIDTH, SCREEN_HEIGHT), accelerated=True, hidden=False):
+        """A Renderer on a new window, or None if no renderer of the kind is available
+        
+        accelerated=False asks for SDL's software renderer.
+        """
+        try:
+            window = sdl2_video.Window(title, size=size, hidden=hidden)
+        except (ImportError, RuntimeError):
+            return None
+        try:
+            return sdl2_video.Renderer(window, accelerated=1 if accelerated else 0)
+        except RuntimeError:
+            window.destroy()
+            return None
+    
+    def upload(self, surface):
+        self.uploads += 1
+        return sdl2_video.Texture.from_surface(self.renderer, surface)
+    
+    def invalidate(self):
+        """Every frame is redrawn in full, so there is nothing to do"""
+    
+    def begin(self):
+        self.items = []
+    
+    def add(self, key, rect, signature, draw_fn, *args):
+        """Queue an item; it is copied from a texture, drawing it with draw_fn(screen, *args) if needed"""
+        self.items.append((key, rect, signature, draw_fn, args))
+    
+    def present(self):
+        """Copy the background and every item to the window and show it
+        
+        Returns the list of rects that were updated, which is always the whole screen.
+        """
+        self.background.draw()
+        copies = 1
+        for key, rect, signature, draw_fn, args in self.items:
+            copy = self.COPIES.get(getattr(draw_fn, "__func__", None))
+            if copy is not None:
+                copies += copy(self, draw_fn.__self__, *args)
+            else:
+                self.copy_item(key, rect, signature, draw_fn, args)
+                copies += 1
+        self.draw_calls = copies
+        if self.profiler is not None:
+            self.profiler.mark("draw")
+        if self.display:
+            self.renderer.present()
+        return [self.scratch.get_rect()]
+    
+    def copy_doll(self, doll):
+        key = (doll.SPECIES, tuple(doll.color))
+        texture = self.sprites.get(key)
+        if texture is None:
+            texture = self.sprites[key] = self.upload(SPRITES.get(type(doll), doll.color))
+        dx, dy = SPRITES.offsets[key]
+        texture.draw(dstrect=(int(doll.x) + dx, int(doll.y) + dy))
+        return 1
+    
+    def claw_part(self, look):
+        """Texture of the claw's "rope", or of its "open" or "closed" body"""
+        texture = self.claw_parts.get(look)
+        if texture is None:
+            # Draw a claw with its rope from (22, 0) and keep the part wanted
+            model = Claw()
+            model.x, model.y = 22, 0
+            if look == "rope":
+                model.rope_length = model.max_rope + 10
+                area = (21, 0, 3, model.rope_length)
+            else:
+                model.is_closing = look == "closed"
+                area = (0, 0, 44, 36)
+            canvas = pygame.Surface((44, model.rope_length + 36), pygame.SRCALPHA)
+            model.draw(canvas)
+            texture = self.claw_parts[look] = self.upload(canvas.subsurface(area))
+        return texture
+    
+    def copy_claw(self, claw):
+        # The same dashes Claw.draw puts above the body, as one slice of the rope
+        copies = 1
+        x = int(claw.x)
+        if claw.rope_length > 0:
+            dashes = -(-claw.rope_length // 10)
+            rope = self.claw_part("rope")
+            height = min(int(dashes - 1) * 10 + 6, rope.height)
+            rope.draw(srcrect=(0, 0, 3, height), dstrect=(x - 1, claw.y, 3, height))
+            copies += 1
+        opened = claw.state <= ClawState.DESCENDING and not claw.is_closing
+        body = self.claw_part("open" if opened else "closed")
+        body.draw(dstrect=(x - 22, int(claw.y + claw.rope_length)))
+        return copies
+    
+    def copy_item(self, key, rect, signature, draw_fn, args):
+        """Copy an item drawn by its draw_fn, uploading it again only when its signature changes"""
+        texture = self.textures.get((key, signature))
+        if texture is None:
+            area = rect.clip(self.scratch.get_rect())
+            self.scratch.fill((0, 0, 0, 0), area)
+            draw_fn(self.scratch, *args)
+            texture = self.textures[(key, signature)] = self.upload(self.scratch.subsurface(area))
+            if len(self.textures) > self.CACHE_SIZE:
+                self.textures.popitem(last=False)  # Drop the least recently used
+        else:
+            self.textures.move_to_end((key, signature))
+        texture.draw(dstrect=rect.clip(self.scratch.get_rect()).topleft)
+
+# Items TextureRenderer copies from its own textures instead of drawing, by draw method
+TextureRenderer.COPIES = {Doll.draw: TextureRenderer.copy_doll, Claw.draw: TextureRenderer.copy_claw}
+
+class ScaledDisplay:
+    """The game's logical SCREEN_WIDTH x SCREEN_HEIGHT screen, shown on a larger window
+    
+    The game draws to `screen` as usual. present() scales it up by the
+    largest whole number that fits the window, nearest-neighbour, into a
+    subsurface of the window centred between black bars. Only the dirty
+    rects are scaled, each through subsurfaces that share the screen's and
+    the window's pixels, so no pixel buffers are allocated. to_logical() maps
+    window positions, such as the mouse, back onto the game's screen.
+    """
+    def __init__(self, window, display=True):
+        width, height = window.get_size()
+        if width < SCREEN_WIDTH or height < SCREEN_HEIGHT:
+            raise ValueError(f"a {width}x{height} window is smaller than the game's {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+        self.window = window
+        self.display = display  # Whether window is the display, to be updated after scaling
+        self.scale = min(width // SCREEN_WIDTH, height // SCREEN_HEIGHT)
+        self.viewport = pygame.Rect(0, 0, SCREEN_WIDTH * self.scale, SCREEN_HEIGHT * self.scale)
+        self.viewport.center = window.get_rect().center
+        self.target = window.subsurface(self.viewport)
+        # Same pixel format as the window, as transform.scale() needs for its destination
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), 0, window)
+        self.scale_time = 0.0  # Seconds spent scaling by the last present()
+        self.total_time = 0.0
+        self.frames = 0
+        self.profiler = None  # FrameProfiler timing the scale phase
+        self.clear()
+    
+    def clear(self):
+        """Paint the letterbox bars; the next present() must then cover the whole screen"""
+        self.window.fill(BLACK)
+        if self.display:
+            pygame.display.flip()
+    
+    def to_window(self, rect):
+        scale = self.scale
+        return pygame.Rect(self.viewport.x + rect.x * scale, self.viewport.y + rect.y * scale,
+                           rect.width * scale, rect.height * scale)
+    
+    def to_logical(self, pos):
+        return ((pos[0] - self.viewport.x) // self.scale, (pos[1] - self.viewport.y) // self.scale)
+    
+    def present(self, dirty):
+        """Scale the dirty rects of the screen into the window and update them"""
+        screen_rect = self.screen.get_rect()
+        dirty = [rect.clip(screen_rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect.width and rect.height]
+        if not dirty:
+            self.scale_time = 0.0
+        else:
+            start = time.perf_counter()
+            scale = self.scale
+            if scale == 1:
+                for rect in dirty:
+                    self.target.blit(self.screen, rect, rect)
+            else:
+                for rect in dirty:
+                    area = pygame.Rect(rect.x * scale, rect.y * scale, rect.width * scale, rect.height * scale)
+                    pygame.transform.scale(self.screen.subsurface(rect), area.size, self.target.subsurface(area))
+            self.scale_time = time.perf_counter() - start
+        self.total_time += self.scale_time
+        self.frames += 1
+        if self.profiler is not None:
+            self.profiler.mark("scale")
+        if dirty and self.display:
+            pygame.display.update([self.to_window(rect) for rect in dirty])
+    
+    def report(self):
+        mean = self.total_time / self.frames * 1000 if self.frames else 0.0
+        return (f"Display: {self.viewport.width}x{self.viewport.height} at {self.scale}x in a "
+                f"{self.window.get_width()}x{self.window.get_height()} window, "
+                f"scaling {mean:.2f} ms per frame on average")
+
+class FrameProfiler:
+    """Per-phase frame timings in a ring buffer, with a HUD summary and trace export
+    
+    The main loop calls begin_frame(), then mark(phase) as each phase ends;
+    a phase's time runs from the previous mark. Without a profiler the loop
+    only pays one `is None` check per phase.
+    """
+    PHASES = ("events", "update", "draw", "scale", "display", "wait")
+    FRAMES = 3600  # One minute at 60 FPS
+    SUMMARY_EVERY = 30  # Frames between overlay refreshes
+    
+    def __init__(self, trace_path=None, frames=FRAMES):
+        self.trace_path = trace_path  # Chrome trace written when the game exits
+        self.frames = frames
+        self.starts = np.zeros(frames)  # perf_counter() at the start of each frame
+        self.times = np.zeros((frames, len(self.PHASES)))  # Seconds spent in each phase
+        self.draw_calls = np.zeros(frames, dtype=np.int32)
+        self.columns = {phase: i for i, phase in enumerate(self.PHASES)}
+        self.count = 0  # Frames recorded, including ones overwritten since
+        self.row = 0
+        self.last = 0.0
+        self.overlay = True
+        self.overlay_lines = ("frame ms  collecting...",)
+    
+    def begin_frame(self):
+        self.row = self.count % self.frames
+        self.times[self.row] = 0
+        self.last = self.starts[self.row] = time.perf_counter()
+    
+    def mark(self, phase):
+        """End the current phase"""
+        now = time.perf_counter()
+        self.times[self.row, self.columns[phase]] += now - self.last
+        self.last = now
+    
+    def end_frame(self, draw_calls=0):
+        self.draw_calls[self.row] = draw_calls
+        self.count += 1
+        if self.count % self.SUMMARY_EVERY == 0:
+            self.overlay_lines = self.summary()
+    
+    def recorded(self):
+        """Row indices of the frames still in the buffer, oldest first"""
+        if self.count <= self.frames:
+            return np.arange(self.count)
+        return (np.arange(self.frames) + self.count) % self.frames
+    
+    def summary(self):
+        """Overlay lines: frame and work time percentiles, and draw calls"""
+        rows = self.recorded()
+        if not rows.size:
+            return ("frame ms  no frames",)
+        times = self.times[rows] * 1000
+        frame = times.sum(axis=1)
+        work = frame - times[:, self.columns["wait"]]
+        calls = self.draw_calls[rows]
+        lines = []
+        for label, values in (("frame", frame), ("work", work)):
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            lines.append(f"{label + ' ms':<9} p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f}")
+        lines.append(f"draw calls  last {calls[-1]}  p99 {np.percentile(calls, 99):.0f}  max {calls.max()}")
+        scale = times[:, self.columns["scale"]]
+        if scale.any():
+            p50, p95, p99 = np.percentile(scale, (50, 95, 99))
+            lines.append(f"{'scale ms':<9} p50 {p50:5.1f}  p95 {p95:5.1f}  p99 {p99:5.1f}")
+        return tuple(lines)
+    
+    def report(self):
+        rows = self.recorded()
+        if not rows.size:
+            return "Profiler: no frames recorded"
+        means = self.times[rows].mean(axis=0) * 1000
+        phases = ", ".join(f"{phase} {mean:.2f}" for phase, mean in zip(self.PHASES, means))
+        return f"Profiler: {rows.size} frames, mean ms per phase: {phases}\n" + "\n".join(self.summary())
+    
+    def export_trace(self, path):
+        """Write the buffered frames as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        rows = self.recorded()
+        origin = self.starts[rows[0]] if rows.size else 0.0
+        events = []
+        for row in rows:
+            start = (self.starts[row] - origin) * 1e6
+            durations = self.times[row] * 1e6
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": start, "dur": durations.sum()})
+            for phase, duration in zip(self.PHASES, durations):
+                if duration > 0:
+                    events.append({"name": phase, "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": start, "dur": duration})
+                start += duration
+            events.append({"name": "draw calls", "ph": "C", "pid": 1, "ts": (self.starts[row] - origin) * 1e6,
+                           "args": {"calls": int(self.draw_calls[row])}})
+        with open(path, "w") as trace:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace)
+        return len(rows)
+
+class Snapshot:
+    """Versioned, struct-packed binary snapshot of a Game's logic state
+    
+    Layout, all little-endian: header (magic, version, seed), the game's
+    counters and flags, its message (length-prefixed UTF-8), the Mersenne
+    Twister state of its RNG, the claw, then the dolls in the machine and
+    the dolls won this round, each as species, RGB color, position, fall
+    speed, resting height and caught/falling flags. The claw's grabbed doll
+    is stored as its index in the machine. Restoring rebuilds the dolls in
+    a fresh DollStore and DollIndex, in the same order.
+    """
+    MAGIC = b"CLAWSNAP"
+    VERSION = 1
+    HEADER = struct.Struct("<8sHq")  # magic, version, seed
+    GAME = struct.Struct("<HHH??hHHH")  # coins, score, time limit, active, round over, time left, timer frames, message timer, message length
+    RNG = struct.Struct("<625I?d")  # Mersenne Twister key and position, gauss_next present and value
+    CLAW = struct.Struct("<dddddB??Hh")  # x, y, rope, max rope, speed, state, closing, fall checked, state frames, grabbed doll
+    DOLL = struct.Struct("<B3Bdddd??")  # species, color, x, y, fall speed, original y, caught, falling
+    COUNTS = struct.Struct("<HH")  # dolls in the machine, dolls won
+    
+    @classmethod
+    def pack(cls, game):
+        claw = game.claw
+        message = game.message.encode("utf-8")
+        version, key, gauss_next = game.rng.getstate()
+        grabbed = game.turtles.index(claw.grabbed_turtle) if claw.grabbed_turtle in game.turtles else -1
+        parts = [
+            cls.HEADER.pack(cls.MAGIC, cls.VERSION, game.seed),
+            cls.GAME.pack(game.coins, game.score, game.time_limit, game.game_active, game.round_over,
+                          game.time_remaining, game.timer_frames, game.message_timer, len(message)),
+            message,
+            cls.RNG.pack(*key, gauss_next is not None, gauss_next or 0.0),
+            cls.CLAW.pack(claw.x, claw.y, claw.rope_length, claw.max_rope, claw.speed,
+                          claw.state, claw.is_closing, claw.fall_check_done,
+                          min(claw.state_frames, 0xFFFF), grabbed),
+            cls.COUNTS.pack(len(game.turtles), len(game.won_turtles)),
+        ]
+        for doll in game.turtles + game.won_turtles:
+            parts.append(cls.DOLL.pack(SPECIES.index(type(doll)), *doll.color, doll.x, doll.y,
+                                       doll.fall_speed, doll.original_y, doll.caught, doll.falling))
+        return b"".join(parts)
+    
+    @classmethod
+    def unpack(cls, game, data):
+        """Put a packed snapshot's state into game; raises ValueError if data is not one"""
+        try:
+            magic, version, seed = cls.HEADER.unpack_from(data)
+            if magic != cls.MAGIC:
+                raise ValueError("not a claw machine snapshot")
+            if version != cls.VERSION:
+                raise ValueError(f"snapshot version {version}, expected {cls.VERSION}")
+            offset = cls.HEADER.size
+            (coins, score, time_limit, game_active, round_over, time_remaining, timer_frames,
+             message_timer, message_length) = cls.GAME.unpack_from(data, offset)
+            offset += cls.GAME.size
+            message = data[offset:offset + message_length].decode("utf-8")
+            offset += message_length
+            rng = cls.RNG.unpack_from(data, offset)
+            offset += cls.RNG.size
+            claw_fields = cls.CLAW.unpack_from(data, offset)
+            offset += cls.CLAW.size
+            in_machine, won = cls.COUNTS.unpack_from(data, offset)
+            offset += cls.COUNTS.size
+            
+            store = DollStore(max(in_machine + won, 1))
+            dolls = []
+            for species, red, green, blue, x, y, fall_speed, original_y, caught, falling in cls.DOLL.iter_unpack(
+                    data[offset:offset + (in_machine + won) * cls.DOLL.size]):
+                doll = SPECIES[species](x, y, (red, green, blue), store)
+                doll.fall_speed = fall_speed
+                doll.original_y = original_y
+                doll.caught = caught
+                doll.falling = falling
+                dolls.append(doll)
+            if len(dolls) != in_machine + won:
+                raise ValueError("snapshot is truncated")
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValueError(f"corrupt snapshot: {e}") from e
+        
+        game.seed = seed
+        game.coins, game.score, game.time_limit = coins, score, time_limit
+        game.game_active, game.round_over = game_active, round_over
+        game.time_remaining, game.timer_frames = time_remaining, timer_frames
+        game.message, game.message_timer = message, message_timer
+        game.rng.setstate((3, rng[:625], rng[626] if rng[625] else None))
+        
+        game.dolls = store
+        game.turtles = dolls[:in_machine]
+        game.won_turtles = dolls[in_machine:]
+        game.doll_index = DollIndex()
+        for doll in game.turtles:
+            game.doll_index.add(doll)
+        
+        claw = game.claw = Claw(game.rng, game.claw_hooks)
+        (claw.x, claw.y, claw.rope_length, claw.max_rope, claw.speed, state, claw.is_closing,
+         claw.fall_check_done, claw.state_frames, grabbed) = claw_fields
+        claw.state = ClawState(state)
+        claw.grabbed_turtle = game.turtles[grabbed] if grabbed >= 0 else None
+    
+    @classmethod
+    def write(cls, game, file):
+        """Overwrite an open binary file with a snapshot of game
+        
+        The snapshot goes out in a single write() call, which a crashing
+        process cannot leave half done. Bytes left over from a longer
+        earlier snapshot are truncated, and unpack() ignores them anyway.
+        """
+        file.seek(0)
+        file.write(cls.pack(game))
+        file.truncate()
+        file.flush()
+    
+    @classmethod
+    def read(cls, game, path):
+        with open(path, "rb") as snapshot:
+            cls.unpack(game, snapshot.read())
+
+# Positions (x, y arrays), species (indexes into SPECIES) and
+# colors (indexes into that species' palette) of a generated layout
+DollPlacement = namedtuple("DollPlacement", ["x", "y", "species", "color"])
+
+class DollLayout:
+    """Seeded, non-overlapping placements for any number of dolls
+    
+    method "poisson" scatters dolls by Poisson-disk sampling, so no two
+    centres are closer than spacing and the gaps look natural. It throws
+    darts at a grid of spacing/sqrt(2) cells, each holding at most one doll,
+    in 3x3 phases: cells three apart cannot conflict, so a whole phase is
+    tested against its neighbourhoods in one batch of numpy operations. "grid"
+    jitters one doll inside each cell of a slightly larger grid, which is
+    quicker still but more regular. Either way the lowest count points are
+    kept, so dolls pile up from the floor of the machine.
+    
+    species_weights gives one weight per entry of SPECIES (Turtle, then
+    Owl); color_weights optionally gives one weight per palette entry for
+    each species. The same seed
+    always gives the same layout.
+    """
+    # Doll centres stay inside the glass drawn by GameAssets.build_background
+    BOUNDS = pygame.Rect(120 + Doll.size, 100 + Doll.size, 560 - 2 * Doll.size, 380 - 2 * Doll.size)
+    ATTEMPTS = 8  # Poisson-disk darts thrown at each empty cell
+    GRID_SLACK = 1.25  # Grid cell size as a multiple of spacing; the rest is jitter
+    
+    def __init__(self, count, bounds=BOUNDS, method="poisson", spacing=2 * Doll.size,
+                 species_weights=(1, 1), color_weights=None):
+        if method not in ("poisson", "grid"):
+            raise ValueError(f"unknown layout method {method!r}")
+        self.count = count
+        self.bounds = pygame.Rect(bounds)
+        self.method = method
+        self.spacing = spacing
+        self.species_weights = np.asarray(species_weights, dtype=float) / sum(species_weights)
+        self.color_weights = [None if weights is None else np.asarray(weights, dtype=float) / sum(weights)
+                              for weights in (color_weights or (None,) * len(SPECIES))]
+    
+    def generate(self, seed):
+        """Return a DollPlacement for count dolls, raising ValueError if they do not fit"""
+        rng = np.random.default_rng(seed)
+        x, y = self.poisson_points(rng) if self.method == "poisson" else self.grid_points(rng)
+        if len(x) < self.count:
+            raise ValueError(f"only {len(x)} dolls fit in {self.bounds} with spacing {self.spacing}")
+        
+        # Keep the lowest points, floor first (and left to right within a tie)
+        keep = np.lexsort((x, -y))[:self.count]
+        x = x[keep] + self.bounds.x
+        y = y[keep] + self.bounds.y
+        
+        species = rng.choice(len(SPECIES), size=self.count, p=self.species_weights)
+        color = np.zeros(self.count, dtype=np.intp)
+        for index, doll_class in enumerate(SPECIES):
+            chosen = species == index
+            color[chosen] = rng.choice(len(doll_class.COLORS), size=int(chosen.sum()), p=self.color_weights[index])
+        return DollPlacement(x, y, species, color)
+    
+    def poisson_points(self, rng):
+        cell = self.spacing / np.sqrt(2)
+        columns = int(np.ceil(self.bounds.width / cell))
+        rows = int(np.ceil(self.bounds.height / cell))
+        # Point in each cell, with a border of two always-empty cells; inf
+        # marks empty. Cells are addressed by flat index from here on.
+        width = columns + 4
+        points_x = np.full((rows + 4) * width, np.inf)
+        points_y = np.full((rows + 4) * width, np.inf)
+        limit = self.spacing ** 2
+        # Cells that can hold a point closer than spacing: the 5x5 block
+        # around a cell, less its centre and corners. The four adjacent cells
+        # come first; they reject most darts, so the rest only see survivors.
+        offsets = sorted(((dy, dx) for dy in range(-2, 3) for dx in range(-2, 3)
+                          if (dy, dx) != (0, 0) and abs(dy) + abs(dx) < 4),
+                         key=lambda offset: abs(offset[0]) + abs(offset[1]))
+        neighbours = np.array([dy * width + dx for dy, dx in offsets])[:, None]
+        phases = []
+        for phase_y in range(3):
+            for phase_x in range(3):
+                cell_y, cell_x = np.mgrid[phase_y:rows:3, phase_x:columns:3]
+                phases.append(((cell_y.ravel() + 2) * width + cell_x.ravel() + 2,
+                               cell_x.ravel() * cell, cell_y.ravel() * cell))
+        
+        for attempt in range(self.ATTEMPTS):
+            for cells, corner_x, corner_y in phases:
+                # One dart at every empty cell of the phase; no two cells in a
+                # phase are close enough to conflict, so they are tested together
+                empty = np.flatnonzero(np.isinf(points_x[cells]))
+                x = corner_x[empty] + rng.random(len(empty)) * cell
+                y = corner_y[empty] + rng.random(len(empty)) * cell
+                target = cells[empty]
+                for group in (neighbours[:4], neighbours[4:]):
+                    near = target + group
+                    ok = ((points_x[near] - x) ** 2 + (points_y[near] - y) ** 2 >= limit).all(axis=0)
+                    x, y, target = x[ok], y[ok], target[ok]
+                inside = (x <= self.bounds.width) & (y <= self.bounds.height)
+                points_x[target[inside]] = x[inside]
+                points_y[target[inside]] = y[inside]
+        
+        filled = ~np.isinf(points_x)
+        return points_x[filled], points_y[filled]
+    
+    def grid_points(self, rng):
+        cell = self.spacing * self.GRID_SLACK
+        columns = int(self.bounds.width // cell) + 1
+        rows = int(self.bounds.height // cell) + 1
+        # Cell centres spread over the bounds (a single row or column goes in the
+        # middle), each moved by at most half the gap beyond spacing
+        line_x = np.linspace(0, self.bounds.width, columns) if columns > 1 else np.array([self.bounds.width / 2])
+        line_y = np.linspace(0, self.bounds.height, rows) if rows > 1 else np.array([self.bounds.height / 2])
+        steps = [line[1] - line[0] for line in (line_x, line_y) if len(line) > 1]
+        jitter = (min(steps, default=cell) - self.spacing) / 2
+        x = np.tile(line_x, rows) + rng.uniform(-jitter, jitter, rows * columns)
+        y = np.repeat(line_y, columns) + rng.uniform(-jitter, jitter, rows * columns)
+        return np.clip(x, 0, self.bounds.width), np.clip(y, 0, self.bounds.height)
+    
+    def spawn(self, placement, store):
+        """Create the placement's dolls in store, returning them in placement order"""
+        return [SPECIES[species](x, y, SPECIES[species].COLORS[color], store)
+                for x, y, species, color in zip(placement.x.tolist(), placement.y.tolist(),
+                                                placement.species.tolist(), placement.color.tolist())]
+
+class Telemetry:
+    """Game events queued without blocking and exported in batches by an asyncio task
+    
+    emit() never waits: events go into a bounded asyncio.Queue, and when
+    the exporter falls behind and the queue is full, new events are dropped
+    and counted instead of holding up a frame. The exporter takes whatever
+    has queued up (up to BATCH_SIZE events) and writes it as JSON lines,
+    either appended to a file from a worker thread or sent to a UNIX socket
+    given as "unix:PATH".
+    """
+    QUEUE_SIZE = 1024
+    BATCH_SIZE = 256
+    
+    def __init__(self, target, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE):
+        self.target = target
+        self.batch_size = batch_size
+        self.queue = asyncio.Queue(queue_size)
+        self.task = None
+        self.file = None
+        self.writer = None
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0  # Events lost because the sink could not be written
+    
+    def emit(self, kind, **fields):
+        event = {"time": time.time(), "event": kind, **fields}
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+    
+    def start(self):
+        """Start the exporter task on the running event loop"""
+        self.task = asyncio.get_running_loop().create_task(self.export())
+    
+    async def export(self):
+        try:
+            if self.target.startswith("unix:"):
+                reader, self.writer = await asyncio.open_unix_connection(self.target[len("unix:"):])
+            else:
+                self.file = open(self.target, "a", encoding="utf-8")
+        except OSError as e:
+            print(f"Telemetry sink unavailable - events will be dropped: {e}")
+        
+        done = False
+        while not done:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            if batch[-1] is None:  # close() was called
+                batch.pop()
+                done = True
+            if batch:
+                await self.write(batch)
+        
+        if self.file is not None:
+            self.file.close()
+        if self.writer is not None:
+            self.writer.close()
+    
+    async def write(self, batch):
+        data = "".join(json.dumps(event) + "\n" for event in batch)
+        try:
+            if self.writer is not None:
+                self.writer.write(data.encode("utf-8"))
+                await self.writer.drain()
+            elif self.file is not None:
+                await asyncio.to_thread(self.write_file, data)
+            else:
+                raise OSError("no sink")
+            self.sent += len(batch)
+            self.batches += 1
+        except OSError:
+            self.failed += len(batch)
+    
+    def write_file(self, data):
+        self.file.write(data)
+        self.file.flush()
+    
+    async def close(self):
+        """Export everything still queued, then stop the exporter"""
+        if self.task is None:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+    
+    def report(self):
+        return (f"Telemetry: {self.sent} events exported in {self.batches} batches, "
+                f"{self.dropped} dropped (queue full), {self.failed} failed")
+
+class GrabLog:
+    """Append-only log of every grab attempt, one memory-mapped file per column
+    
+    Each column is a flat file of fixed-width little-endian values,
+    DIRECTORY/<column>.col, grown CHUNK rows at a time. The number of rows
+    is kept in DIRECTORY/rows and bumped after a row is written, so a crash
+    loses at most the row being written. The queries run numpy over the
+    mapped columns without making Python objects per attempt.
+    """
+    OUTCOMES = ("success", "miss", "fall", "timeout")
+    SUCCESS, MISS, FALL, TIMEOUT = range(4)
+    COLUMNS = {
+        "outcome": "u1",  # Index into OUTCOMES
+        "claw_x": "<f4",
+        "depth": "<f4",  # Rope length when the claw closed, NaN if it never did
+        "species": "i1",  # Index into the module's SPECIES, -1 without a target doll
+        "color": "u1",  # Index into the species' COLORS, NO_COLOR if it is not in them
+        "seconds_left": "<f4",  # On the coin's timer when the attempt ended
+        "grab_time": "<f4",  # Seconds from the coin to the claw closing, NaN if it never did
+    }
+    NO_COLOR = 255
+    CHUNK = 65536
+    
+    def __init__(self, directory, writable=True):
+        self.directory = directory
+        self.writable = writable
+        if writable:
+            os.makedirs(directory, exist_ok=True)
+        rows_path = os.path.join(directory, "rows")
+        if writable and not os.path.exists(rows_path):
+            with open(rows_path, "wb") as file:
+                file.write(bytes(8))
+        self.rows = np.memmap(rows_path, dtype="<u8", mode="r+" if writable else "r", shape=(1,))
+        self.count = int(self.rows[0])
+        self.columns = {}
+        self.capacity = 0
+        self.map(self.count)
+    
+    def path(self, column):
+        return os.path.join(self.directory, column + ".col")
+    
+    def map(self, rows):
+        """Map every column, growing the files to hold at least `rows` rows if writable"""
+        self.columns = {}  # Unmap the old arrays before the files are resized
+        if not self.writable:
+            for name, dtype in self.COLUMNS.items():
+                if self.count:
+                    self.columns[name] = np.memmap(self.path(name), dtype=dtype, mode="r", shape=(self.count,))
+                else:
+                    self.columns[name] = np.empty(0, dtype=dtype)  # An empty file cannot be mapped
+            self.capacity = self.count
+            return
+        capacity = max(-(-rows // self.CHUNK), 1) * self.CHUNK
+        for name, dtype in self.COLUMNS.items():
+            size = capacity * np.dtype(dtype).itemsize
+            with open(self.path(name), "ab") as file:
+                if file.tell() < size:
+                    file.truncate(size)
+            self.columns[name] = np.memmap(self.path(name), dtype=dtype, mode="r+", shape=(capacity,))
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def append(self, outcome, claw_x, depth, doll, seconds_left, grab_time):
+        """Log one attempt; doll is the target doll, or None"""
+        if self.count == self.capacity:
+            self.map(self.count + 1)
+        row = self.count
+        columns = self.columns
+        columns["outcome"][row] = outcome
+        columns["claw_x"][row] = claw_x
+        columns["depth"][row] = depth
+        if doll is None:
+            columns["species"][row] = -1
+            columns["color"][row] = self.NO_COLOR
+        else:
+            columns["species"][row] = SPECIES.index(type(doll))
+            color = tuple(doll.color)
+            columns["color"][row] = doll.COLORS.index(color) if color in doll.COLORS else self.NO_COLOR
+        columns["seconds_left"][row] = seconds_left
+        columns["grab_time"][row] = grab_time
+        self.count += 1
+        self.rows[0] = self.count
+    
+    def extend(self, **columns):
+        """Log many attempts at once, given an array for every column"""
+        rows = len(columns["outcome"])
+        if self.count + rows > self.capacity:
+            self.map(self.count + rows)
+        for name in self.COLUMNS:
+            self.columns[name][self.count:self.count + rows] = columns[name]
+        self.count += rows
+        self.rows[0] = self.count
+    
+    def flush(self):
+        if self.writable:
+            for column in self.columns.values():
+                column.flush()
+            self.rows.flush()
+    
+    def close(self):
+        self.flush()
+        self.columns = {}
+        self.rows = None
+    
+    def column(self, name):
+        """The logged rows of a column, as a view onto the mapped file"""
+        return self.columns[name][:self.count]
+    
+    def outcome_counts(self):
+        counts = np.bincount(self.column("outcome"), minlength=len(self.OUTCOMES))
+        return dict(zip(self.OUTCOMES, counts.tolist()))
+    
+    def heatmap(self, bins=16, x_range=None):
+        """Success rate against claw x
+        
+        Returns the bin edges, the attempts in each bin and each bin's
+        success rate (NaN where there were no attempts). x_range defaults
+        to the range of logged claw positions.
+        """
+        x = self.column("claw_x")
+        if x_range is None:
+            x_range = (float(x.min()), float(x.max())) if len(x) else (0.0, SCREEN_WIDTH)
+        low, high = x_range
+        edges = np.linspace(low, high, bins + 1)
+        index = ((x - low) * (bins / max(high - low, 1e-9))).astype(np.intp)
+        np.clip(index, 0, bins - 1, out=index)
+        attempts = np.bincount(index, minlength=bins)
+        successes = np.bincount(index, weights=self.column("outcome") == self.SUCCESS, minlength=bins)
+        with np.errstate(invalid="ignore"):
+            return edges, attempts, successes / attempts
+    
+    def slip_rates(self):
+        """Fraction of grabbed dolls of each species that slipped from the claw, by species name"""
+        outcome = self.column("outcome")
+        species = self.column("species").astype(np.intp) + 1  # Shifted so "no doll" (-1) is a valid bin
+        slips = outcome == self.FALL
+        slipped = np.bincount(species, weights=slips, minlength=len(SPECIES) + 1)[1:]
+        grabbed = np.bincount(species, weights=slips | (outcome == self.SUCCESS), minlength=len(SPECIES) + 1)[1:]
+        with np.errstate(invalid="ignore"):
+            rates = slipped / grabbed
+        return {doll_class.SPECIES: float(rate) for doll_class, rate in zip(SPECIES, rates)}
+    
+    def time_to_grab(self, percentiles=(50, 90, 99)):
+        """Percentiles of the seconds from the coin to closing the claw, over successful attempts"""
+        times = self.column("grab_time")[self.column("outcome") == self.SUCCESS]
+        if not len(times):
+            return {q: float("nan") for q in percentiles}
+        return dict(zip(percentiles, np.percentile(times, percentiles).tolist()))
+    
+    def report(self):
+        counts = self.outcome_counts()
+        lines = [f"Grab log {self.directory}: {self.count} attempts, "
+                 + ", ".join(f"{count} {outcome}" for outcome, count in counts.items())]
+        if self.count:
+            edges, attempts, rates = self.heatmap(bins=8)
+            for low, high, n, rate in zip(edges, edges[1:], attempts, rates):
+                lines.append(f"  claw x {low:5.0f}-{high:<5.0f} {n:>9} attempts  {rate:6.1%} success")
+            lines.append("  slip rate: " + ", ".join(f"{species} {rate:.1%}" for species, rate in self.slip_rates().items()))
+            lines.append("  time to grab: " + ", ".join(f"p{q} {seconds:.2f} s" for q, seconds in self.time_to_grab().items()))
+        return "\n".join(lines)
+
+class GameAssets:
+    """Fonts, sound effects and the static background, built once and shared
+    
+    Every Game draws with the same fonts and background and plays the same
+    Sound objects, so cabinets after the first cost only their own state and
+    screen. Doll sprites are shared through SPRITES, which this also fills.
+    """
+    shared_assets = None
+    
+    def __init__(self, sound=True, bank=None):
+        sound = bootstrap(display=False, mixer=sound) and sound
+        self.font = pygame.font.Font(None, 48)
+        self.small_font = pygame.font.Font(None, 32)
+        self.tiny_font = pygame.font.Font(None, 24)
+        
+        # Sound effects (generated once, then loaded from the on-disk cache)
+        self.sounds = None
+        if sound:
+            try:
+                start = time.perf_counter()
+                if bank is not None:
+                    self.sounds = bank.sounds()
+                else:
+                    self.sounds = {name: AUDIO_CACHE.sound(generator) for name, generator in SOUND_EFFECTS.items()}
+                STARTUP.record("sound effects", start)
+                print(f"Sound effects ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+            except Exception as e:
+                print(f"Sound generation failed - continuing without sound: {e}")
+        
+        # Pre-render doll sprites once instead of redrawing them every frame
+        start = time.perf_counter()
+        SPRITES.build()
+        self.background = self.build_background()
+        STARTUP.record("sprites and background", start)
+    
+    @classmethod
+    def shared(cls):
+        """The assets every Game uses unless it is given its own"""
+        if cls.shared_assets is None:
+            cls.shared_assets = cls()
+        return cls.shared_assets
+    
+    @staticmethod
+    def build_background():
+        """Render everything that never changes into one Surface"""
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background.fill(BLUE)
+        
+        # Draw pixel art checkerboard floor
+        for i in range(0, SCREEN_WIDTH, 40):
+            for j in range(SCREEN_HEIGHT - 80, SCREEN_HEIGHT, 40):
+                if (i + j) % 80 == 0:
+                    pygame.draw.rect(background, DARK_BROWN, (i, j, 40, 40))
+                else:
+                    pygame.draw.rect(background, BROWN, (i, j, 40, 40))
+        
+        # Machine cabinet (pixel art style)
+        # Outer frame
+        pygame.draw.rect(background, DARK_BROWN, (100, 80, 600, 440))
+        pygame.draw.rect(background, BLACK, (100, 80, 600, 440), 4)
+        
+        # Inner play area
+        pygame.draw.rect(background, LIGHT_BLUE, (120, 100, 560, 380))
+        pygame.draw.rect(background, BLACK, (120, 100, 560, 380), 3)
+        
+        # Glass reflection effect (pixel art style)
+        pygame.draw.rect(background, WHITE, (130, 110, 80, 100), 2)
+        pygame.draw.rect(background, WHITE, (600, 150, 60, 80), 1)
+        
+        # Prize chute/door at bottom
+        pygame.draw.rect(background, DARK_GRAY, (320, 460, 160, 40))
+        pygame.draw.rect(background, BLACK, (320, 460, 160, 40), 3)
+        pygame.draw.rect(background, GRAY, (340, 470, 120, 20))
+        
+        # Score panel (the claw never reaches it, so it can live in the background)
+        pygame.draw.rect(background, DARK_GRAY, (SCREEN_WIDTH - 180, 20, 160, 80))
+        pygame.draw.rect(background, BLACK, (SCREEN_WIDTH - 180, 20, 160, 80), 3)
+        
+        return background.convert() if pygame.display.get_surface() is not None else background
+
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("🎮 Claw Machine - Pixel Art Edition")
+    CAPTION = "🎮 Claw Machine - Pixel Art Edition"
+    
+    # "Play Again" button shown when a round is over
+    PLAY_AGAIN_RECT = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 80, 200, 60)
+    
+    SNAPSHOT_EVERY = 30  # Steps between snapshots when snapshot_path is set (half a second)
+    
+    def __init__(self, headless=False, seed=None, screen=None, assets=None, sound=True, layout=None,
+                 renderer="surface", display_size=None):
+        # Headless games run the game logic only: no window, fonts or sound.
+        # Given a screen, the game draws offscreen to that Surface instead of
+        # opening the window, and sound=False keeps it quiet. A DollLayout
+        # replaces the classic 14 dolls. renderer="texture" draws the window
+        # with a TextureRenderer on an accelerated SDL renderer, falling back
+        # to surfaces without one; "software" uses SDL's software renderer.
+        # The window then has no screen Surface. With a display_size the
+        # window is that big ((0, 0) for fullscreen) and a ScaledDisplay
+        # shows the game in it at a whole-number scale.
+        self.headless = headless
+        self.layout = layout
+        self.offscreen = screen is not None
+        # All game randomness (doll spawns, slips) comes from this seedable RNG.
+        # Unseeded games pick a seed so an input journal can replay them.
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        
         self.clock = pygame.time.Clock()
+        sdl_renderer = None
+        self.display = None
+        if not headless:
+            if screen is None:
+                bootstrap(fonts=False, mixer=False)
+                start = time.perf_counter()
+                if renderer != "surface":
+                    sdl_renderer = TextureRenderer.open(self.CAPTION, accelerated=renderer == "texture")
+                    if sdl_renderer is None:
+                        print(f"No {renderer} renderer available - drawing with surfaces")
+                if sdl_renderer is None and display_size is not None:
+                    window = pygame.display.set_mode(display_size, pygame.FULLSCREEN if display_size == (0, 0) else 0)
+                    pygame.display.set_caption(self.CAPTION)
+                    self.display = ScaledDisplay(window)
+                    screen = self.display.screen
+                elif sdl_renderer is None:
+                    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+                    pygame.display.set_caption(self.CAPTION)
+                STARTUP.record("window", start)
+            self.screen = screen
         
-        self.claw = Claw()
+        # Called on every claw state transition; see Claw
+        self.claw_hooks = []
+        self.claw = Claw(self.rng, self.claw_hooks)
         self.turtles = []
         self.spawn_turtles()
         
-        self.coins = 12
+        self.coins = COINS_PER_ROUND
         self.score = 0
         self.game_active = False
         self.won_turtles = []
@@ -775,41 +3026,93 @@ class Game:
         self.time_remaining = self.time_limit
         self.timer_frames = 0
         
-        # Fonts
-        self.font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 32)
-        self.tiny_font = pygame.font.Font(None, 24)
-        
-        # Sound effects
-        try:
-            self.sounds = {
-                'coin': SoundGenerator.coin_sound(),
-                'move': SoundGenerator.move_sound(),
-                'victory': SoundGenerator.victory_sound(),
-                'fall': SoundGenerator.fall_sound(),
-                'grab': SoundGenerator.grab_sound()
-            }
-            self.sound_enabled = True
-            
-            # Generate and play lo-fi background music
-            print("Generating lo-fi background music...")
-            self.bg_music = SoundGenerator.lofi_music()
-            self.bg_music.play(loops=-1)  # Loop forever
-            self.bg_music.set_volume(0.3)  # Quiet background volume
-            print("Background music playing!")
-        except Exception as e:
-            self.sound_enabled = False
-            print(f"Sound generation failed - continuing without sound: {e}")
-        
         self.running = True
         self.message = "Press ENTER to Insert Coin!"
         self.message_timer = 180
         
         # Play Again button
         self.button_rect = None
+        
+        # Claw position before the last update(), for interpolated drawing
+        self.previous_claw = None
+        
+        # Frame-time profiler, off unless enable_profiler() is called
+        self.profiler = None
+        
+        # InputJournal recording this session's input, if any
+        self.journal = None
+        # Open file the game state is snapshotted to while playing, if any
+        self.snapshot_file = None
+        self.snapshot_countdown = self.SNAPSHOT_EVERY
+        self.accept_input = True  # False while a replay is driving the game
+        # Telemetry receiving the game's events, if any
+        self.telemetry = None
+        # GrabLog every coin's attempt is logged to, if any, and what is known of the current attempt
+        self.grab_log = None
+        self.attempt_logged = False
+        self.attempt_target = None  # Doll nearest the claw when it closed
+        self.close_depth = float("nan")
+        self.close_time = float("nan")
+        
+        self.bg_music = None
+        self.sound_enabled = False
+        if headless:
+            return
+        
+        # Fonts, sounds, sprites and the background are shared by every Game
+        self.assets = assets or GameAssets.shared()
+        self.font = self.assets.font
+        self.small_font = self.assets.small_font
+        self.tiny_font = self.assets.tiny_font
+        self.sounds = self.assets.sounds
+        self.sound_enabled = sound and self.sounds is not None
+        if self.sound_enabled:
+            # Lo-fi background music is synthesised block by block on its own thread
+            self.load_music()
+            self.voices = VoicePool(self.sounds)
+        
+        # Static background is drawn once; only changed regions are redrawn
+        if sdl_renderer is not None:
+            self.renderer = TextureRenderer(sdl_renderer, self.assets.background)
+        else:
+            # A ScaledDisplay updates the window itself once the frame is scaled
+            display = not self.offscreen and self.display is None
+            self.renderer = LayeredRenderer(self.screen, self.assets.background, display=display)
+    
+    def enable_profiler(self, trace_path=None):
+        """Time every frame's phases and show the summary overlay (F3 toggles it)"""
+        self.profiler = FrameProfiler(trace_path)
+        self.renderer.profiler = self.profiler
+        if self.display is not None:
+            self.display.profiler = self.profiler
+        self.profiler_font = pygame.font.Font(None, 20)
+    
+    def load_music(self):
+        """Start streaming endless lo-fi background music"""
+        try:
+            print("Starting lo-fi background music...")
+            start = time.perf_counter()
+            # Keep the music channel out of reach of Sound.play() for effects
+            pygame.mixer.set_reserved(MUSIC_CHANNEL + 1)
+            music = MusicStream()
+            music.play(pygame.mixer.Channel(MUSIC_CHANNEL), volume=0.3)  # Quiet background volume
+            self.bg_music = music
+            STARTUP.record("music", start)
+            print(f"Background music playing! (ready in {(time.perf_counter() - start) * 1000:.1f} ms)")
+        except Exception as e:
+            print(f"Music generation failed - continuing without music: {e}")
     
     def spawn_turtles(self):
         """Spawn cute turtles and owls in the machine"""
+        if self.layout is not None:
+            placement = self.layout.generate(self.rng.getrandbits(64))
+            self.dolls = DollStore(self.layout.count)
+            self.turtles = self.layout.spawn(placement, self.dolls)
+            self.doll_index = DollIndex()
+            for turtle in self.turtles:
+                self.doll_index.add(turtle)
+            return
+        
         positions = [
             (200, 420), (280, 440), (360, 430), (440, 445), (520, 435), (600, 425),
             (240, 370), (320, 380), (400, 375), (480, 385), (560, 370),
@@ -817,42 +3120,94 @@ class Game:
         ]
         
         self.turtles = []
+        self.dolls = DollStore(len(positions))
         for pos in positions:
             # Randomly choose between turtle and owl (50/50 chance)
-            if random.random() < 0.5:
-                color = random.choice(TURTLE_COLORS)
-                self.turtles.append(Turtle(pos[0], pos[1], color))
+            if self.rng.random() < 0.5:
+                color = self.rng.choice(TURTLE_COLORS)
+                self.turtles.append(Turtle(pos[0], pos[1], color, self.dolls))
             else:
-                color = random.choice(OWL_COLORS)
-                self.turtles.append(Owl(pos[0], pos[1], color))
+                color = self.rng.choice(OWL_COLORS)
+                self.turtles.append(Owl(pos[0], pos[1], color, self.dolls))
+        
+        # Spatial index used by check_grab
+        self.doll_index = DollIndex()
+        for turtle in self.turtles:
+            self.doll_index.add(turtle)
+    
+    def emit(self, kind, **fields):
+        """Report a game event to telemetry, if it is on"""
+        if self.telemetry is not None:
+            self.telemetry.emit(kind, **fields)
+    
+    def start_grab_log(self, directory):
+        """Log every coin's grab attempt to a GrabLog in directory"""
+        self.grab_log = GrabLog(directory)
+        self.claw_hooks.append(self.note_close)
+    
+    def note_close(self, state, next_state, frames):
+        """Claw hook remembering how deep, when and over which doll the claw closed"""
+        if next_state == ClawState.CLOSING:
+            self.close_depth = self.claw.rope_length
+            self.close_time = self.time_limit - self.seconds_left()
+            self.attempt_target = self.nearest_doll()
+    
+    def seconds_left(self):
+        return self.time_remaining - self.timer_frames / FPS
+    
+    def nearest_doll(self):
+        """The doll in the machine closest to the claw's x, or None"""
+        store = self.dolls
+        count = len(store)
+        if not count:
+            return None
+        distance = np.abs(store.x[:count] - self.claw.x)
+        distance[store.caught[:count]] = np.inf
+        slot = int(np.argmin(distance))
+        return store.dolls[slot] if np.isfinite(distance[slot]) else None
+    
+    def log_attempt(self, outcome, doll=None):
+        """Log the coin's attempt with its outcome, once, if the grab log is on"""
+        if self.grab_log is None or self.attempt_logged:
+            return
+        self.attempt_logged = True
+        if doll is None:
+            doll = self.attempt_target or self.nearest_doll()
+        self.grab_log.append(outcome, self.claw.x, self.close_depth, doll, self.seconds_left(), self.close_time)
     
     def insert_coin(self):
         """Insert a coin to start the game"""
         if self.coins > 0 and not self.game_active and not self.round_over:
             self.coins -= 1
+            self.emit("coin", coins_left=self.coins, score=self.score)
             self.game_active = True
-            self.claw.state = "moving"
+            if self.claw.state != ClawState.MOVING:
+                self.claw.reset()
             self.time_remaining = self.time_limit
             self.timer_frames = 0
+            self.attempt_logged = False
+            self.attempt_target = None
+            self.close_depth = self.close_time = float("nan")
             self.message = "Move: ←→ | SPACE: Drop & Close Claw!"
             self.message_timer = 120
             
             # Play coin sound
             if self.sound_enabled:
-                self.sounds['coin'].play()
+                self.voices.play('coin')
 
     
     def start_new_round(self):
         """Start a new round with 12 fresh coins"""
-        self.coins = 12
+        self.coins = COINS_PER_ROUND
         self.score = 0
         self.won_turtles = []
         self.round_over = False
         self.game_active = False
         self.spawn_turtles()
-        self.claw = Claw()
+        self.claw = Claw(self.rng, self.claw_hooks)
         self.message = "New Round! Press ENTER to Insert Coin!"
         self.message_timer = 120
+        self.emit("new_round")
     
     def check_grab(self):
         """Check if claw grabbed a turtle when it closes"""
@@ -862,48 +3217,174 @@ class Game:
             # Claw grab area (pixel perfect)
             claw_rect = pygame.Rect(claw_x - 15, claw_y + 25, 30, 15)
             
-            for turtle in self.turtles:
-                if claw_rect.colliderect(turtle.rect) and not turtle.caught:
+            for turtle in self.doll_index.query(claw_rect):
+                if not turtle.caught:
                     # Grabbed!
-                    turtle.caught = True
-                    self.claw.grabbed_turtle = turtle
-                    self.message = "Got a Turtle! 🐢"
-                    self.message_timer = 60
+                    self.handle_claw_event(self.claw.grab(turtle))
                     break
     
+    def handle_claw_event(self, event):
+        """React to a ClawEvent from the claw"""
+        self.CLAW_EVENT_HANDLERS[event.kind](self, event.doll)
+    
+    def on_grab(self, doll):
+        # Whatever was resting on the doll loses its support
+        self.dolls.wake_above(doll.slot)
+        self.message = "Got a Turtle! 🐢"
+        self.message_timer = 60
+    
+    def on_slip(self, doll):
+        self.emit("fall", x=self.claw.x, depth=self.claw.rope_length)
+        self.log_attempt(GrabLog.FALL, doll)
+        # The doll falls back down from where the claw lost it
+        doll.caught = False
+        doll.falling = True  # Start falling animation
+        doll.fall_speed = 0
+        if self.sound_enabled:
+            self.voices.play('fall')
+    
+    def on_success(self, doll):
+        # Successfully caught a turtle!
+        self.score += 1
+        self.emit("catch", species=doll.SPECIES, score=self.score)
+        self.log_attempt(GrabLog.SUCCESS, doll)
+        self.won_turtles.append(doll)
+        self.turtles.remove(doll)
+        self.doll_index.remove(doll)
+        self.claw.grabbed_turtle = None
+        
+        # Play grab sound
+        if self.sound_enabled:
+            self.voices.play('grab')
+        
+        # Show success message
+        self.message = f"🎉🎊 SUCCESS! Score: {self.score}"
+        self.message_timer = 120
+        self.game_active = False
+    
+    def on_miss(self, doll):
+        self.emit("miss", x=self.claw.x)
+        self.log_attempt(GrabLog.MISS)  # Already logged as a fall if the doll slipped
+        self.game_active = False
+        self.message = "Try Again! Press ENTER"
+        self.message_timer = 120
+    
+    # Indexed by ClawEventKind
+    CLAW_EVENT_HANDLERS = (on_grab, on_slip, on_success, on_miss)
+    
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    if self.round_over:
-                        # Start new round
-                        self.start_new_round()
-                    else:
-                        # Insert coin
-                        self.insert_coin()
-                if event.key == pygame.K_SPACE and self.game_active:
-                    if self.claw.state == "moving":
-                        # First press: start descending
-                        self.claw.start_descend()
-                        self.message = "Press SPACE again to close!"
-                        self.message_timer = 60
-                    elif self.claw.state == "descending":
-                        # Second press: close the claw
-                        self.claw.close_claw()
-                        self.check_grab()  # Check immediately when closing
-            
-            # Mouse click events
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left click
-                    mouse_pos = pygame.mouse.get_pos()
-                    # Check if clicked on Play Again button
-                    if self.round_over and self.button_rect:
-                        if self.button_rect.collidepoint(mouse_pos):
-                            self.start_new_round()
+            self.handle_event(event)
     
-    def update(self):
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        if event.type == pygame.VIDEOEXPOSE and self.display is not None:
+            self.display.clear()
+            self.renderer.invalidate()
+        if not self.accept_input:
+            return
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                self.press_enter()
+            if event.key == pygame.K_SPACE:
+                self.press_space()
+            if event.key == pygame.K_F3 and self.profiler is not None:
+                self.profiler.overlay = not self.profiler.overlay
+        
+        # Mouse click events
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left click
+                self.click(self.mouse_pos())
+    
+    def mouse_pos(self):
+        """Mouse position on the game's screen, which may be scaled in the window"""
+        if self.display is not None:
+            return self.display.to_logical(pygame.mouse.get_pos())
+        return pygame.mouse.get_pos()
+    
+    def press_enter(self):
+        if self.journal is not None:
+            self.journal.event(InputJournal.ENTER)
+        if self.round_over:
+            # Start new round
+            self.start_new_round()
+        else:
+            # Insert coin
+            self.insert_coin()
+    
+    def press_space(self):
+        if self.journal is not None:
+            self.journal.event(InputJournal.SPACE)
+        if not self.game_active:
+            return
+        if self.claw.state == ClawState.MOVING:
+            # First press: start descending
+            self.claw.start_descend()
+            self.message = "Press SPACE again to close!"
+            self.message_timer = 60
+        elif self.claw.state == ClawState.DESCENDING:
+            # Second press: close the claw
+            self.claw.close_claw()
+            self.check_grab()  # Check immediately when closing
+    
+    def click(self, mouse_pos):
+        if self.journal is not None:
+            self.journal.event(InputJournal.CLICK, mouse_pos)
+        # Check if clicked on Play Again button
+        if self.round_over and self.PLAY_AGAIN_RECT.collidepoint(mouse_pos):
+            self.start_new_round()
+    
+    def held_keys(self):
+        """(left, right) movement keys currently held on the keyboard"""
+        keys = pygame.key.get_pressed()
+        return (bool(keys[pygame.K_LEFT] or keys[pygame.K_a]), bool(keys[pygame.K_RIGHT] or keys[pygame.K_d]))
+    
+    def live_step(self):
+        """Advance one step with the keyboard's movement keys, journaling them"""
+        held = self.held_keys()
+        if self.journal is not None:
+            self.journal.step(*held)
+        self.update(held)
+        
+        if self.snapshot_file is not None:
+            self.snapshot_countdown -= 1
+            if self.snapshot_countdown <= 0:
+                self.save_snapshot()
+    
+    def start_snapshots(self, path):
+        """Snapshot the game to path every SNAPSHOT_EVERY steps and on exit"""
+        try:
+            self.snapshot_file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        except OSError as e:
+            print(f"Could not open snapshot file - continuing without: {e}")
+    
+    def save_snapshot(self):
+        self.snapshot_countdown = self.SNAPSHOT_EVERY
+        try:
+            Snapshot.write(self, self.snapshot_file)
+        except OSError as e:
+            print(f"Could not save snapshot - continuing without: {e}")
+            self.snapshot_file.close()
+            self.snapshot_file = None
+    
+    def checkpoint(self):
+        """Packed Snapshot of the game-logic state that restore() can return to"""
+        return Snapshot.pack(self)
+    
+    def restore(self, checkpoint):
+        """Return to a checkpoint() or any other packed Snapshot"""
+        Snapshot.unpack(self, checkpoint)
+        self.previous_claw = None
+        if not self.headless:
+            self.renderer.invalidate()
+    
+    def update(self, held=None):
+        """Advance the game by one frame
+        
+        held is a (left, right) pair saying which movement keys are down;
+        by default it is read from the keyboard.
+        """
         if self.game_active:
             # Update timer
             self.timer_frames += 1
@@ -913,9 +3394,10 @@ class Game:
                 
                 if self.time_remaining <= 0:
                     # Time's up!
+                    self.emit("timeout", holding=self.claw.grabbed_turtle is not None)
+                    self.log_attempt(GrabLog.TIMEOUT, self.claw.grabbed_turtle)
                     self.game_active = False
-                    self.claw.state = "moving"
-                    self.claw.rope_length = 0
+                    self.claw.reset()
                     if self.claw.grabbed_turtle:
                         self.claw.grabbed_turtle.caught = False
                         self.claw.grabbed_turtle = None
@@ -923,122 +3405,173 @@ class Game:
                     self.message_timer = 120
             
             # Handle movement
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            if held is None:
+                held = self.held_keys()
+            left, right = held
+            if left:
                 self.claw.move_left()
-                if self.sound_enabled and self.claw.state == "moving":
-                    self.sounds['move'].play()
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            if right:
                 self.claw.move_right()
-                if self.sound_enabled and self.claw.state == "moving":
-                    self.sounds['move'].play()
+            if self.sound_enabled:
+                # The motor whirs for as long as the claw is being moved
+                self.voices.hold('move', (left or right) and self.claw.state == ClawState.MOVING)
             
             # Update claw
-            result = self.claw.update()
-            
-            if result == True:
-                # Successfully caught a turtle!
-                self.score += 1
-                self.won_turtles.append(self.claw.grabbed_turtle)
-                self.turtles.remove(self.claw.grabbed_turtle)
-                self.claw.grabbed_turtle = None
-                
-                # Play grab sound
-                if self.sound_enabled:
-                    self.sounds['grab'].play()
-                
-                # Show success message
-                self.message = f"🎉🎊 SUCCESS! Score: {self.score}"
-                self.message_timer = 120
-                self.game_active = False
-            elif result == False:
-                # Failed to catch anything
-                self.game_active = False
-                self.message = "Try Again! Press ENTER"
-                self.message_timer = 120
-            elif result == "fall":
-                # Turtle fell - play fall sound
-                if self.sound_enabled:
-                    self.sounds['fall'].play()
+            event = self.claw.update()
+            if event is not None:
+                self.handle_claw_event(event)
+            elif self.claw.grabbed_turtle:
+                self.doll_index.move(self.claw.grabbed_turtle)
             
             # Check if round is over (all coins used)
             if not self.game_active and self.coins == 0 and not self.round_over:
                 self.round_over = True
-                if self.score >= 5:
+                self.emit("round_over", score=self.score, won=self.score >= WIN_SCORE)
+                if self.score >= WIN_SCORE:
                     self.message = f"🏆 YOU WON! {self.score} dolls!"
                     # Play victory sound for round win
                     if self.sound_enabled:
-                        self.sounds['victory'].play()
+                        self.voices.play('victory')
                 else:
                     self.message = f"Round Over! You caught {self.score} dolls!"
                 self.message_timer = 300
+        elif self.sound_enabled:
+            self.voices.hold('move', False)  # The claw only moves while a coin is in play
         
         # Update message timer
         if self.message_timer > 0:
             self.message_timer -= 1
+        
+        self.update_dolls()
     
-    def draw(self):
-        # Background
-        self.screen.fill(BLUE)
+    def update_dolls(self):
+        """Advance the falling animation of every doll"""
+        slots, previous_y = self.dolls.fall()
+        if len(slots):
+            self.doll_index.move_fallen(self.dolls, slots, previous_y)
+    
+    def draw_coin_panel(self, screen):
+        # Draw coin slot (pixel art)
+        coin_slot_x = 20
+        coin_slot_y = 20
+        pygame.draw.rect(screen, DARK_GRAY, (coin_slot_x, coin_slot_y, 160, 100))
+        pygame.draw.rect(screen, BLACK, (coin_slot_x, coin_slot_y, 160, 100), 3)
+        pygame.draw.rect(screen, BLACK, (coin_slot_x + 40, coin_slot_y + 20, 80, 8))
         
-        # Draw pixel art checkerboard floor
-        for i in range(0, SCREEN_WIDTH, 40):
-            for j in range(SCREEN_HEIGHT - 80, SCREEN_HEIGHT, 40):
-                if (i + j) % 80 == 0:
-                    pygame.draw.rect(self.screen, DARK_BROWN, (i, j, 40, 40))
-                else:
-                    pygame.draw.rect(self.screen, BROWN, (i, j, 40, 40))
+        # Coin display
+        coin_text = TEXT_CACHE.render(self.small_font, f"Coins: {self.coins}", GOLD)
+        screen.blit(coin_text, (coin_slot_x + 20, coin_slot_y + 40))
         
-        # Machine cabinet (pixel art style)
-        # Outer frame
-        pygame.draw.rect(self.screen, DARK_BROWN, (100, 80, 600, 440))
-        pygame.draw.rect(self.screen, BLACK, (100, 80, 600, 440), 4)
+        # Draw coin icons
+        for i in range(min(self.coins, 5)):
+            coin_x = coin_slot_x + 20 + (i * 25)
+            coin_y = coin_slot_y + 75
+            pygame.draw.circle(screen, GOLD, (coin_x, coin_y), 8)
+            pygame.draw.circle(screen, ORANGE, (coin_x, coin_y), 6)
+            pygame.draw.circle(screen, BLACK, (coin_x, coin_y), 8, 2)
+    
+    def draw_timer(self, screen, timer_color):
+        # Timer panel
+        pygame.draw.rect(screen, DARK_GRAY, (SCREEN_WIDTH // 2 - 80, 120, 160, 50))
+        pygame.draw.rect(screen, BLACK, (SCREEN_WIDTH // 2 - 80, 120, 160, 50), 3)
         
-        # Inner play area
-        pygame.draw.rect(self.screen, LIGHT_BLUE, (120, 100, 560, 380))
-        pygame.draw.rect(self.screen, BLACK, (120, 100, 560, 380), 3)
+        # Timer text
+        timer_text = TEXT_CACHE.render(self.small_font, f"Time: {self.time_remaining}s", timer_color)
+        timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 145))
+        screen.blit(timer_text, timer_rect)
+    
+    def draw_message(self, screen):
+        message_surface = TEXT_CACHE.render(self.font, self.message, YELLOW)
+        message_rect = message_surface.get_rect(center=(SCREEN_WIDTH // 2, 40))
+        # Pixel art shadow
+        shadow_surface = TEXT_CACHE.render(self.font, self.message, BLACK)
+        shadow_rect = shadow_surface.get_rect(center=(SCREEN_WIDTH // 2 + 2, 42))
+        screen.blit(shadow_surface, shadow_rect)
+        screen.blit(message_surface, message_rect)
+    
+    def draw_text(self, screen, font, text, color, pos):
+        screen.blit(TEXT_CACHE.render(font, text, color), pos)
+    
+    def round_over_layout(self):
+        """Text lines of the round-over screen as (font, text, color, topleft)"""
+        button_y = SCREEN_HEIGHT // 2 + 80
+        if self.score >= WIN_SCORE:
+            # Player won!
+            return [
+                (self.tiny_font, "Click to Play Again", WHITE, (SCREEN_WIDTH // 2 - 80, button_y + 80)),
+                (self.font, "🏆 YOU WON! 🏆", GOLD, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 60)),
+                (self.small_font, f"Amazing! You caught {self.score} dolls!", YELLOW, (SCREEN_WIDTH // 2 - 160, SCREEN_HEIGHT // 2 - 10)),
+            ]
+        # Round over, didn't win
+        return [
+            (self.tiny_font, "Click to Play Again", WHITE, (SCREEN_WIDTH // 2 - 80, button_y + 80)),
+            (self.font, "ROUND OVER!", YELLOW, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 60)),
+            (self.small_font, f"You caught {self.score} dolls!", WHITE, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 10)),
+            (self.tiny_font, "(Need 5 or more to win)", RED, (SCREEN_WIDTH // 2 - 90, SCREEN_HEIGHT // 2 + 20)),
+        ]
+    
+    def draw_round_over(self, screen, is_hovering, lines):
+        # Button background (lighter when hovering)
+        button_x, button_y, button_width, button_height = self.button_rect
+        button_color = (120, 230, 120) if is_hovering else GREEN
+        pygame.draw.rect(screen, button_color, self.button_rect)
+        pygame.draw.rect(screen, BLACK, self.button_rect, 4)
         
-        # Glass reflection effect (pixel art style)
-        pygame.draw.rect(self.screen, WHITE, (130, 110, 80, 100), 2)
-        pygame.draw.rect(self.screen, WHITE, (600, 150, 60, 80), 1)
+        # Button highlight
+        pygame.draw.rect(screen, WHITE, (button_x + 5, button_y + 5, button_width - 10, 8))
         
-        # Prize chute/door at bottom
-        pygame.draw.rect(self.screen, DARK_GRAY, (320, 460, 160, 40))
-        pygame.draw.rect(self.screen, BLACK, (320, 460, 160, 40), 3)
-        pygame.draw.rect(self.screen, GRAY, (340, 470, 120, 20))
+        # Button text
+        play_again_text = TEXT_CACHE.render(self.small_font, "PLAY AGAIN", WHITE)
+        text_rect = play_again_text.get_rect(center=(SCREEN_WIDTH // 2, button_y + 30))
+        screen.blit(play_again_text, text_rect)
+        
+        # Click instruction and round over message
+        for font, text, color, pos in lines:
+            screen.blit(TEXT_CACHE.render(font, text, color), pos)
+    
+    def save_positions(self):
+        """Remember where the claw and dolls are before an update()"""
+        self.dolls.save()
+        self.previous_claw = (self.claw, self.claw.x, self.claw.rope_length)
+    
+    def draw(self, alpha=1.0):
+        """Draw the game with moving things `alpha` of the way from their previous step"""
+        if alpha >= 1.0:
+            self.draw_frame()
+            return
+        
+        claw = self.claw
+        real_claw = (claw.x, claw.rope_length)
+        real_dolls = self.dolls.blend(alpha)
+        if self.previous_claw and self.previous_claw[0] is claw:
+            _, x, rope_length = self.previous_claw
+            claw.x += (x - claw.x) * (1 - alpha)
+            claw.rope_length += (rope_length - claw.rope_length) * (1 - alpha)
+        try:
+            self.draw_frame()
+        finally:
+            claw.x, claw.rope_length = real_claw
+            self.dolls.restore(real_dolls)
+    
+    def draw_frame(self):
+        renderer = self.renderer
+        renderer.begin()
         
         # Draw turtles
         for turtle in self.turtles:
-            turtle.update()  # Update falling animation
-            turtle.draw(self.screen)
+            renderer.add(turtle, SPRITES.rect(turtle), (int(turtle.x), int(turtle.y)), turtle.draw)
         
         # Draw claw
-        self.claw.draw(self.screen)
-        
-        # Draw coin slot (pixel art)
-        coin_slot_x = 20
-        coin_slot_y = 20
-        pygame.draw.rect(self.screen, DARK_GRAY, (coin_slot_x, coin_slot_y, 160, 100))
-        pygame.draw.rect(self.screen, BLACK, (coin_slot_x, coin_slot_y, 160, 100), 3)
-        pygame.draw.rect(self.screen, BLACK, (coin_slot_x + 40, coin_slot_y + 20, 80, 8))
-        
-        # Coin display
-        coin_text = self.small_font.render(f"Coins: {self.coins}", True, GOLD)
-        self.screen.blit(coin_text, (coin_slot_x + 20, coin_slot_y + 40))
+        claw = self.claw
+        renderer.add(claw, claw.get_rect(), (claw.x, claw.rope_length, claw.state, claw.is_closing), claw.draw)
         
-        # Draw coin icons
-        for i in range(min(self.coins, 5)):
-            coin_x = coin_slot_x + 20 + (i * 25)
-            coin_y = coin_slot_y + 75
-            pygame.draw.circle(self.screen, GOLD, (coin_x, coin_y), 8)
-            pygame.draw.circle(self.screen, ORANGE, (coin_x, coin_y), 6)
-            pygame.draw.circle(self.screen, BLACK, (coin_x, coin_y), 8, 2)
+        # Coin slot panel is drawn over the claw when it is at the far left
+        renderer.add("coins", pygame.Rect(20, 20, 160, 100), self.coins, self.draw_coin_panel)
         
-        # Score display (pixel art panel)
-        pygame.draw.rect(self.screen, DARK_GRAY, (SCREEN_WIDTH - 180, 20, 160, 80))
-        pygame.draw.rect(self.screen, BLACK, (SCREEN_WIDTH - 180, 20, 160, 80), 3)
-        score_text = self.small_font.render(f"Score: {self.score}", True, GREEN)
-        self.screen.blit(score_text, (SCREEN_WIDTH - 160, 50))
+        # Score display (panel is part of the background)
+        score_label = f"Score: {self.score}"
+        score_rect = TEXT_CACHE.render(self.small_font, score_label, GREEN).get_rect(topleft=(SCREEN_WIDTH - 160, 50))
+        renderer.add("score", score_rect, score_label, self.draw_text, self.small_font, score_label, GREEN, score_rect.topleft)
         
         # Timer display (when game is active)
         if self.game_active:
@@ -1049,95 +3582,1290 @@ class Game:
                 timer_color = ORANGE
             else:
                 timer_color = RED
-            
-            # Timer panel
-            pygame.draw.rect(self.screen, DARK_GRAY, (SCREEN_WIDTH // 2 - 80, 120, 160, 50))
-            pygame.draw.rect(self.screen, BLACK, (SCREEN_WIDTH // 2 - 80, 120, 160, 50), 3)
-            
-            # Timer text
-            timer_text = self.small_font.render(f"Time: {self.time_remaining}s", True, timer_color)
+            timer_panel = pygame.Rect(SCREEN_WIDTH // 2 - 80, 120, 160, 50)
+            timer_text = TEXT_CACHE.render(self.small_font, f"Time: {self.time_remaining}s", timer_color)
             timer_rect = timer_text.get_rect(center=(SCREEN_WIDTH // 2, 145))
-            self.screen.blit(timer_text, timer_rect)
+            renderer.add("timer", timer_panel.union(timer_rect), (self.time_remaining, timer_color), self.draw_timer, timer_color)
         
         # Draw message
         if self.message_timer > 0:
-            message_surface = self.font.render(self.message, True, YELLOW)
+            message_surface = TEXT_CACHE.render(self.font, self.message, YELLOW)
             message_rect = message_surface.get_rect(center=(SCREEN_WIDTH // 2, 40))
-            # Pixel art shadow
-            shadow_surface = self.font.render(self.message, True, BLACK)
-            shadow_rect = shadow_surface.get_rect(center=(SCREEN_WIDTH // 2 + 2, 42))
-            self.screen.blit(shadow_surface, shadow_rect)
-            self.screen.blit(message_surface, message_rect)
+            renderer.add("message", message_rect.union(message_rect.move(2, 2)), self.message, self.draw_message)
         
         # Instructions at bottom
+        instruction = None
         if not self.game_active and self.coins > 0 and not self.round_over:
-            instruction = self.tiny_font.render("Press ENTER to Insert Coin", True, WHITE)
-            self.screen.blit(instruction, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT - 30))
-        elif self.game_active and self.claw.state == "moving":
-            instruction = self.tiny_font.render("← → to Move | SPACE to Drop Claw", True, WHITE)
-            self.screen.blit(instruction, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 30))
-        elif self.game_active and self.claw.state == "descending":
-            instruction = self.tiny_font.render("SPACE to Close Claw and Grab!", True, YELLOW)
-            self.screen.blit(instruction, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT - 30))
+            instruction = ("Press ENTER to Insert Coin", WHITE, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT - 30))
+        elif self.game_active and self.claw.state == ClawState.MOVING:
+            instruction = ("← → to Move | SPACE to Drop Claw", WHITE, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 30))
+        elif self.game_active and self.claw.state == ClawState.DESCENDING:
+            instruction = ("SPACE to Close Claw and Grab!", YELLOW, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT - 30))
         elif self.round_over:
             # Draw "Play Again" button
-            button_width = 200
-            button_height = 60
-            button_x = SCREEN_WIDTH // 2 - button_width // 2
-            button_y = SCREEN_HEIGHT // 2 + 80
-            
-            # Store button rect for click detection
-            self.button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
+            self.button_rect = self.PLAY_AGAIN_RECT
             
-            # Check if mouse is hovering over button
-            mouse_pos = pygame.mouse.get_pos()
+            # Check if mouse is hovering over button (offscreen cabinets have no mouse)
+            mouse_pos = (-1, -1) if self.offscreen else self.mouse_pos()
             is_hovering = self.button_rect.collidepoint(mouse_pos)
             
-            # Button background (lighter when hovering)
-            button_color = (120, 230, 120) if is_hovering else GREEN
-            pygame.draw.rect(self.screen, button_color, self.button_rect)
-            pygame.draw.rect(self.screen, BLACK, self.button_rect, 4)
-            
-            # Button highlight
-            pygame.draw.rect(self.screen, WHITE, (button_x + 5, button_y + 5, button_width - 10, 8))
-            
-            # Button text
-            play_again_text = self.small_font.render("PLAY AGAIN", True, WHITE)
-            text_rect = play_again_text.get_rect(center=(SCREEN_WIDTH // 2, button_y + 30))
-            self.screen.blit(play_again_text, text_rect)
-            
-            # Instruction
-            instruction = self.tiny_font.render("Click to Play Again", True, WHITE)
-            self.screen.blit(instruction, (SCREEN_WIDTH // 2 - 80, button_y + button_height + 20))
-            
-            # Round over message
-            if self.score >= 5:
-                # Player won!
-                game_over = self.font.render("🏆 YOU WON! 🏆", True, GOLD)
-                self.screen.blit(game_over, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 60))
-                final_score = self.small_font.render(f"Amazing! You caught {self.score} dolls!", True, YELLOW)
-                self.screen.blit(final_score, (SCREEN_WIDTH // 2 - 160, SCREEN_HEIGHT // 2 - 10))
-            else:
-                # Round over, didn't win
-                game_over = self.font.render("ROUND OVER!", True, YELLOW)
-                self.screen.blit(game_over, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 60))
-                final_score = self.small_font.render(f"You caught {self.score} dolls!", True, WHITE)
-                self.screen.blit(final_score, (SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2 - 10))
-                need_more = self.tiny_font.render("(Need 5 or more to win)", True, RED)
-                self.screen.blit(need_more, (SCREEN_WIDTH // 2 - 90, SCREEN_HEIGHT // 2 + 20))
+            lines = self.round_over_layout()
+            overlay_rect = self.button_rect.unionall(
+                [TEXT_CACHE.render(font, text, color).get_rect(topleft=pos) for font, text, color, pos in lines])
+            renderer.add("round_over", overlay_rect, (self.score, is_hovering), self.draw_round_over, is_hovering, lines)
         
-        pygame.display.flip()
+        if instruction:
+            text, color, pos = instruction
+            instruction_rect = TEXT_CACHE.render(self.tiny_font, text, color).get_rect(topleft=pos)
+            renderer.add("instruction", instruction_rect, instruction, self.draw_text, self.tiny_font, text, color, pos)
+        
+        # Profiler overlay, below the machine
+        if self.profiler is not None and self.profiler.overlay:
+            lines = self.profiler.overlay_lines
+            renderer.add("profiler", self.profiler_rect(lines), lines, self.draw_profiler, lines)
+        
+        dirty = renderer.present()
+        if self.display is not None:
+            self.display.present(dirty)
     
-    def run(self):
+    @staticmethod
+    def profiler_rect(lines):
+        return pygame.Rect(8, 524, 270, 5 + 13 * len(lines))
+    
+    def draw_profiler(self, screen, lines):
+        pygame.draw.rect(screen, BLACK, self.profiler_rect(lines))
+        for i, line in enumerate(lines):
+            screen.blit(self.profiler_font.render(line, True, GREEN), (14, 528 + i * 13))
+    
+    def frames(self, speed=1.0, step=None):
+        """The main loop, yielding after each frame for the caller to wait out
+        
+        Game logic runs in fixed STEP ticks with one interpolated draw per
+        frame. Elapsed wall time (times `speed`) is banked in an accumulator
+        and spent on whole steps, so the coin timer and physics keep real time
+        however fast frames render. speed > 1 runs the game faster than real
+        time. step() advances the game one tick; by default live_step() plays
+        from the keyboard. Cleans up with shutdown() when the game quits.
+        """
+        step = step or self.live_step
+        accumulator = 0.0
+        previous = time.perf_counter()
+        self.save_positions()
+        profiler = self.profiler
         while self.running:
+            if profiler is not None:
+                profiler.begin_frame()
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME) * speed
+            previous = now
+            
             self.handle_events()
-            self.update()
-            self.draw()
+            if profiler is not None:
+                profiler.mark("events")
+            while accumulator >= STEP and self.running:
+                self.save_positions()
+                step()
+                accumulator -= STEP
+            if profiler is not None:
+                profiler.mark("update")
+            self.draw(accumulator / STEP)  # The renderer marks the end of "draw"
+            if profiler is not None:
+                profiler.mark("display")
+            yield
+            if profiler is not None:
+                profiler.mark("wait")
+                profiler.end_frame(self.renderer.draw_calls)
+        self.shutdown()
+    
+    def run(self, speed=1.0, step=None):
+        """Blocking main loop, paced by pygame's clock"""
+        for _ in self.frames(speed, step):
             self.clock.tick(FPS)
-        
         pygame.quit()
         sys.exit()
+    
+    async def run_async(self, speed=1.0, step=None, telemetry=None):
+        """Main loop as a coroutine that yields to other tasks between frames
+        
+        With telemetry, the game's events are exported by a task running in
+        the gaps between frames.
+        """
+        if telemetry is not None:
+            self.telemetry = telemetry
+            telemetry.start()
+        frame_start = time.perf_counter()
+        for _ in self.frames(speed, step):
+            # Sleep out the rest of the frame, always yielding at least once
+            await asyncio.sleep(max(0.0, frame_start + 1 / FPS - time.perf_counter()))
+            frame_start = time.perf_counter()
+        if telemetry is not None:
+            await telemetry.close()
+            print(telemetry.report())
+        pygame.quit()
+    
+    def shutdown(self):
+        """Stop the music and write out snapshots, journals and reports"""
+        profiler = self.profiler
+        if self.bg_music is not None:
+            self.bg_music.stop()
+        if self.sound_enabled:
+            self.voices.stop()
+            print(self.voices.report())
+        if self.snapshot_file is not None:
+            self.save_snapshot()
+            if self.snapshot_file is not None:
+                self.snapshot_file.close()
+        if self.journal is not None:
+            self.journal.close()
+            print(f"Recorded {self.journal.steps} steps to {self.journal.path}")
+        if self.grab_log is not None:
+            self.grab_log.close()
+            print(f"Grab log {self.grab_log.directory} holds {self.grab_log.count} attempts")
+        print(TEXT_CACHE.report())
+        if self.display is not None:
+            print(self.display.report())
+        if profiler is not None:
+            print(profiler.report())
+            if profiler.trace_path:
+                frames = profiler.export_trace(profiler.trace_path)
+                print(f"Wrote {frames} frames to {profiler.trace_path}")
+
+# Scripted input for one frame: movement keys held, and keys/clicks pressed this frame
+FrameInput = namedtuple("FrameInput", ["left", "right", "enter", "space", "click"],
+                        defaults=(False, False, False, False, None))
+IDLE = FrameInput()
+PRESS_ENTER = FrameInput(enter=True)
+PRESS_SPACE = FrameInput(space=True)
+HOLD_LEFT = FrameInput(left=True)
+HOLD_RIGHT = FrameInput(right=True)
+
+class AutoPlayer:
+    """Scripted player that lines the claw up over a doll and grabs it
+    
+    Call it with (game, frame) to get that frame's FrameInput. Subclasses
+    can override choose_target() and aim_x() to play differently.
+    """
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.target = None
+        self.target_x = None
+        self.close_y = None
+    
+    def choose_target(self, game):
+        """Pick the doll to go for with this coin"""
+        dolls = [doll for doll in game.turtles if not doll.caught and not doll.falling]
+        return self.rng.choice(dolls) if dolls else None
+    
+    def aim_x(self, game, target):
+        """Claw x position to drop at for the chosen doll"""
+        return target.x
+    
+    def aim_y(self, game, target):
+        """Depth at which to close the claw for the chosen doll"""
+        return target.y
+    
+    def __call__(self, game, frame):
+        if game.round_over or not game.game_active:
+            # Start the next round, or insert the next coin
+            self.target = None
+            return PRESS_ENTER
+        
+        claw = game.claw
+        if claw.state == ClawState.MOVING:
+            if self.target is None:
+                self.target = self.choose_target(game)
+                if self.target is None:
+                    return PRESS_SPACE  # Nothing left to aim at
+                self.target_x = min(max(self.aim_x(game, self.target), 150), SCREEN_WIDTH - 150)
+                self.close_y = self.aim_y(game, self.target)
+            dx = self.target_x - claw.x
+            if abs(dx) <= claw.speed / 2:
+                return PRESS_SPACE
+            return HOLD_LEFT if dx < 0 else HOLD_RIGHT
+        
+        if claw.state == ClawState.DESCENDING:
+            # Close once the middle of the grab area reaches the aimed depth
+            claw_x, claw_y = claw.get_claw_pos()
+            if claw_y + 32 >= self.close_y:
+                return PRESS_SPACE
+        return IDLE
+
+class JitteredPlayer(AutoPlayer):
+    """AutoPlayer whose aim is off by Gaussian noise, like a real player"""
+    def __init__(self, seed=None, spread=16):
+        super().__init__(seed)
+        self.spread = spread  # Standard deviation in pixels
+    
+    def aim_x(self, game, target):
+        return target.x + self.rng.gauss(0, self.spread)
+    
+    def aim_y(self, game, target):
+        return target.y + self.rng.gauss(0, self.spread)
+
+class RandomPlayer(AutoPlayer):
+    """Drops at a random position and closes at a random depth"""
+    def aim_x(self, game, target):
+        return self.rng.uniform(150, SCREEN_WIDTH - 150)
+    
+    def aim_y(self, game, target):
+        claw_top = game.claw.y + 32
+        return self.rng.uniform(claw_top, claw_top + game.claw.max_rope)
+
+# Aiming strategies for the Monte-Carlo simulator
+STRATEGIES = {
+    "perfect": AutoPlayer,
+    "jittered": JitteredPlayer,
+    "random": RandomPlayer,
+}
+
+class Simulation:
+    """Headless, deterministic game driven by a scripted input stream
+    
+    Runs the same update logic as the windowed game, with no display, no
+    mixer and no frame cap. script(game, frame) returns each frame's
+    FrameInput; by default an AutoPlayer plays. The game and the default
+    player are seeded, so the same seed always plays out the same way.
+    """
+    def __init__(self, script=None, seed=0, game=None):
+        self.game = game or Game(headless=True, seed=seed)
+        self.script = script or AutoPlayer(f"{seed}:player")
+        self.frame = 0
+        self.elapsed = 0.0
+        self.scores = []  # Final score of every finished round
+    
+    def step(self):
+        """Apply one frame of scripted input and update the game"""
+        game = self.game
+        inputs = self.script(game, self.frame)
+        if inputs.enter:
+            game.press_enter()
+        if inputs.space:
+            game.press_space()
+        if inputs.click is not None:
+            game.click(inputs.click)
+        
+        was_over = game.round_over
+        game.update(held=(inputs.left, inputs.right))
+        if game.round_over and not was_over:
+            self.scores.append(game.score)
+        self.frame += 1
+    
+    def run(self, rounds=None, frames=None):
+        """Step until `rounds` more rounds have finished or `frames` more frames have run"""
+        target_rounds = None if rounds is None else len(self.scores) + rounds
+        target_frame = None if frames is None else self.frame + frames
+        start = time.perf_counter()
+        while ((target_rounds is None or len(self.scores) < target_rounds)
+               and (target_frame is None or self.frame < target_frame)):
+            self.step()
+        self.elapsed += time.perf_counter() - start
+        return self
+    
+    def frames_per_second(self):
+        return self.frame / self.elapsed if self.elapsed else 0.0
+    
+    def report(self):
+        wins = sum(score >= WIN_SCORE for score in self.scores)
+        win_rate = wins / len(self.scores) if self.scores else 0.0
+        return (f"{len(self.scores)} rounds, {self.frame} frames in {self.elapsed:.2f} s "
+                f"({self.frames_per_second():,.0f} simulated frames/s), "
+                f"{wins} wins ({win_rate:.1%})")
+
+class CabinetHost:
+    """Many independent Game cabinets in one process, driven by one scheduler
+    
+    Each cabinet is a Game drawing to its own offscreen Surface, played by
+    a scripted player as in attract mode. All cabinets share one GameAssets,
+    so fonts, sounds, the background and doll sprites exist once. step()
+    advances every cabinet by one STEP and draw() redraws them all.
+    """
+    def __init__(self, count, seed=0, strategy="jittered", assets=None):
+        self.assets = assets or GameAssets.shared()
+        self.cabinets = []
+        for i in range(count):
+            game = Game(seed=seed + i, screen=pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)),
+                        assets=self.assets, sound=False)
+            self.cabinets.append(Simulation(STRATEGIES[strategy](f"{seed + i}:player"), game=game))
+        self.steps = 0
+    
+    def step(self):
+        for cabinet in self.cabinets:
+            cabinet.step()
+        self.steps += 1
+    
+    def draw(self):
+        for cabinet in self.cabinets:
+            cabinet.game.draw()
+    
+    def grid(self, size):
+        """Screen rect of each cabinet when tiled into a window of this size"""
+        columns = int(np.ceil(np.sqrt(len(self.cabinets))))
+        rows = -(-len(self.cabinets) // columns)
+        width, height = size[0] // columns, size[1] // rows
+        return [pygame.Rect(i % columns * width, i // columns * height, width, height)
+                for i in range(len(self.cabinets))]
+    
+    def run(self, window, speed=1.0):
+        """Show every cabinet tiled in window, with the same fixed-step loop as Game.run"""
+        cells = self.grid(window.get_size())
+        clock = pygame.time.Clock()
+        accumulator = 0.0
+        previous = time.perf_counter()
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME) * speed
+            previous = now
+            while accumulator >= STEP:
+                self.step()
+                accumulator -= STEP
+            
+            self.draw()
+            for cabinet, cell in zip(self.cabinets, cells):
+                pygame.transform.scale(cabinet.game.screen, cell.size, window.subsurface(cell))
+            pygame.display.flip()
+            clock.tick(FPS)
+
+class InputJournal:
+    """Compact binary record of a session's input, for exact replays
+    
+    The file is a header (magic, format version, steps per second, and the
+    length of a Snapshot of the game as recording began, which follows it)
+    and then one byte per update() step giving the held movement keys. Key
+    presses and clicks are written as their own records just before the
+    step they precede: 0x80 ENTER, 0x81 SPACE, and 0x82 CLICK followed by x
+    and y as unsigned 16-bit integers. Replaying the same seed and records
+    reproduces the session exactly.
+    """
+    MAGIC = b"CLAWJRNL"
+    VERSION = 3  # Since 3, dolls settle on each other, so older sessions replay differently
+    HEADER = struct.Struct("<8sHHI")  # magic, version, steps per second, snapshot length
+    CLICK_POSITION = struct.Struct("<HH")
+    LEFT = 0x01
+    RIGHT = 0x02
+    ENTER = 0x80
+    SPACE = 0x81
+    CLICK = 0x82
+    
+    def __init__(self, path, game):
+        self.path = path
+        self.steps = 0
+        start = Snapshot.pack(game)
+        self.file = open(path, "wb")
+        self.file.write(self.HEADER.pack(self.MAGIC, self.VERSION, FPS, len(start)))
+        self.file.write(start)
+    
+    def event(self, kind, position=None):
+        """Record a key press or click applied before the next step"""
+        self.file.write(bytes((kind,)))
+        if kind == self.CLICK:
+            x, y = position
+            self.file.write(self.CLICK_POSITION.pack(max(0, x), max(0, y)))
+    
+    def step(self, left, right):
+        """Record one update() with these movement keys held"""
+        self.file.write(bytes(((self.LEFT if left else 0) | (self.RIGHT if right else 0),)))
+        self.steps += 1
+    
+    def close(self):
+        self.file.close()
+    
+    @classmethod
+    def read(cls, path):
+        """Load a journal as (start, held, events)
+        
+        start is the packed Snapshot the session began from.
+        held has one byte of movement key bits per step, and events maps a
+        step index to the (kind, position) events applied before it.
+        """
+        with open(path, "rb") as journal:
+            data = journal.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"{path} is not an input journal")
+        magic, version, steps_per_second, start_length = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError(f"{path} is not an input journal")
+        if version != cls.VERSION or steps_per_second != FPS:
+            raise ValueError(f"{path} has journal version {version} at {steps_per_second} steps/s; "
+                             f"expected version {cls.VERSION} at {FPS}")
+        
+        start = data[cls.HEADER.size:cls.HEADER.size + start_length]
+        held = bytearray()
+        events = {}
+        i = cls.HEADER.size + start_length
+        while i < len(data):
+            record = data[i]
+            i += 1
+            if record < cls.ENTER:
+                held.append(record)
+            elif record == cls.CLICK:
+                if i + cls.CLICK_POSITION.size > len(data):
+                    break  # Truncated by a crash mid-write
+                events.setdefault(len(held), []).append((record, cls.CLICK_POSITION.unpack_from(data, i)))
+                i += cls.CLICK_POSITION.size
+            elif record in (cls.ENTER, cls.SPACE):
+                events.setdefault(len(held), []).append((record, None))
+            else:
+                raise ValueError(f"{path}: bad journal record {record:#x} at byte {i - 1}")
+        return start, bytes(held), events
+
+class Replay:
+    """Re-runs a recorded InputJournal, headless at full speed or in the window
+    
+    A checkpoint of the game state is kept every CHECKPOINT_EVERY steps as
+    the replay advances, so seek() can jump to any step by restoring the
+    nearest earlier checkpoint and stepping only from there.
+    """
+    CHECKPOINT_EVERY = 600  # Steps (10 s of play) between checkpoints
+    
+    def __init__(self, path, headless=True):
+        start, self.held, self.events = InputJournal.read(path)
+        self.game = Game(headless=headless)
+        self.game.restore(start)
+        self.game.accept_input = False
+        self.frame = 0
+        self.checkpoints = {0: self.game.checkpoint()}
+    
+    def __len__(self):
+        return len(self.held)
+    
+    def finished(self):
+        return self.frame >= len(self.held)
+    
+    def step(self):
+        """Apply the next recorded step; does nothing once the journal is used up"""
+        if self.finished():
+            return
+        game = self.game
+        for kind, position in self.events.get(self.frame, ()):
+            if kind == InputJournal.ENTER:
+                game.press_enter()
+            elif kind == InputJournal.SPACE:
+                game.press_space()
+            else:
+                game.click(position)
+        held = self.held[self.frame]
+        game.update(held=(bool(held & InputJournal.LEFT), bool(held & InputJournal.RIGHT)))
+        self.frame += 1
+        if self.frame % self.CHECKPOINT_EVERY == 0 and self.frame not in self.checkpoints:
+            self.checkpoints[self.frame] = game.checkpoint()
+    
+    def seek(self, frame):
+        """Put the game in its state just before step `frame`"""
+        frame = max(0, min(frame, len(self.held)))
+        nearest = max(saved for saved in self.checkpoints if saved <= frame)
+        if frame < self.frame or nearest > self.frame:
+            self.game.restore(self.checkpoints[nearest])
+            self.frame = nearest
+        while self.frame < frame:
+            self.step()
+        return self
+    
+    def run(self):
+        """Replay every remaining step as fast as possible"""
+        while not self.finished():
+            self.step()
+        return self
+    
+    def play(self, speed=1.0):
+        """Replay in the game window at `speed` times real time"""
+        self.game.run(speed, step=self.step)
+
+def print_progress(done, total, elapsed):
+    """monte_carlo() progress callback: one status line, rewritten in place, with an ETA"""
+    minutes, seconds = divmod(round(elapsed / done * (total - done)), 60)
+    print(f"\r{done:,}/{total:,} rounds ({done / total:.0%}), {done / elapsed:,.0f} rounds/s, "
+          f"about {minutes} min {seconds:02d} s left ", end="" if done < total else "\n",
+          file=sys.stderr, flush=True)
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score confidence interval for a binomial proportion (95% by default)"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * ((p * (1 - p) + z * z / (4 * trials)) / trials) ** 0.5 / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+def simulate_rounds(strategy, rounds, seed_sequence):
+    """Play rounds headless and return (score histogram, frames simulated)
+    
+    Runs in a worker process. The game and the player each get their own
+    stream spawned from seed_sequence, so every batch is independent.
+    """
+    game_seed, player_seed = (int(child.generate_state(1)[0]) for child in seed_sequence.spawn(2))
+    simulation = Simulation(STRATEGIES[strategy](player_seed), seed=game_seed).run(rounds=rounds)
+    histogram = [0] * (COINS_PER_ROUND + 1)
+    for score in simulation.scores:
+        histogram[score] += 1
+    return histogram, simulation.frame
+
+class MonteCarloResult:
+    """Score histogram of many simulated rounds"""
+    def __init__(self, strategy, histogram, frames, elapsed, workers):
+        self.strategy = strategy
+        self.histogram = histogram  # histogram[score] = number of rounds
+        self.frames = frames
+        self.elapsed = elapsed
+        self.workers = workers
+    
+    @property
+    def rounds(self):
+        return sum(self.histogram)
+    
+    @property
+    def wins(self):
+        return sum(self.histogram[WIN_SCORE:])
+    
+    def report(self):
+        rounds = self.rounds
+        low, high = wilson_interval(self.wins, rounds)
+        lines = [
+            f"Strategy {self.strategy}: {rounds:,} rounds on {self.workers} workers in {self.elapsed:.2f} s "
+            f"({rounds / self.elapsed:,.0f} rounds/s, {self.frames / self.elapsed:,.0f} frames/s)",
+            f"Win rate {self.wins / rounds:.2%} (95% CI {low:.2%} - {high:.2%})",
+            "Score  Rounds     Share  95% CI",
+        ]
+        for score, count in enumerate(self.histogram):
+            low, high = wilson_interval(count, rounds)
+            bar = "#" * round(40 * count / rounds)
+            marker = "*" if score >= WIN_SCORE else " "
+            lines.append(f"{score:>4}{marker} {count:>7,} {count / rounds:8.2%}  {low:6.2%} - {high:6.2%}  {bar}")
+        lines.append(f"(* = win, {WIN_SCORE}+ dolls)")
+        return "\n".join(lines)
+
+def monte_carlo(strategy, rounds, workers=None, seed=0, batch_rounds=500, progress=None):
+    """Simulate rounds across a process pool and return a MonteCarloResult
+    
+    Rounds are split into batches of at most batch_rounds, each with its own
+    seed spawned from seed, so results depend on the seed and batch size but
+    not on how many workers run them. Each core plays only about 70 rounds a
+    second, so big runs take a while: progress(done, rounds, elapsed) is
+    called as each batch comes back.
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = [batch_rounds] * (rounds // batch_rounds)
+    if rounds % batch_rounds:
+        batches.append(rounds % batch_rounds)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    
+    histogram = [0] * (COINS_PER_ROUND + 1)
+    frames = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_histogram, batch_frames in pool.map(simulate_rounds, [strategy] * len(batches), batches, seeds):
+            histogram = [a + b for a, b in zip(histogram, batch_histogram)]
+            frames += batch_frames
+            if progress is not None:
+                progress(sum(histogram), rounds, time.perf_counter() - start)
+    return MonteCarloResult(strategy, histogram, frames, time.perf_counter() - start, workers)
+
+def bench_audio_startup():
+    """Time loading every sound with an empty (cold) and a filled (warm) cache"""
+    generators = list(SOUND_EFFECTS.values()) + [SoundGenerator.lofi_music]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = AudioCache(directory)
+        for label in ("cold", "warm"):
+            total = 0.0
+            for generator in generators:
+                start = time.perf_counter()
+                cache.sound(generator)
+                elapsed = time.perf_counter() - start
+                total += elapsed
+                print(f"{label:>5} {generator.__name__:<14} {elapsed * 1000:9.2f} ms")
+            print(f"{label:>5} {'total':<14} {total * 1000:9.2f} ms")
+
+def bench_sample_bank():
+    """Per effect: rendering it vs copying it from a bank into the mixer, and bank attach time
+    
+    Attaching saves the render; the copy into the mixer, and the memory it
+    takes, is paid by every process either way.
+    """
+    name = f"claw-bench-{os.getpid()}"
+    start = time.perf_counter()
+    bank = SampleBank.create(name)
+    created = time.perf_counter() - start
+    
+    print(f"{'effect':<10}{'frames':>8}{'mixer copy':>12}{'render ms':>11}{'copy ms':>9}")
+    for effect, generator in SOUND_EFFECTS.items():
+        frames = SoundGenerator.frames(generator)
+        out = np.empty((frames, 2), dtype=np.int16)
+        samples = bank.samples(effect)
+        render_time = measure(lambda: generator(out=out))[0]
+        copy_time = measure(lambda samples=samples: pygame.mixer.Sound(buffer=samples))[0]
+        print(f"{effect:<10}{frames:>8}{frames * 4 / 1024:>9.1f} KB{render_time * 1000:>11.2f}{copy_time * 1000:>9.2f}")
+        del samples  # Views must be released before bank.close()
+    
+    # Attach from a fresh interpreter, as a second game would (a forked child
+    # would share this process's resource tracker)
+    code = "import runpy, sys; print(runpy.run_path(sys.argv[1])['time_bank_attach'](sys.argv[2]))"
+    result = subprocess.run([sys.executable, "-c", code, os.path.abspath(__file__), name],
+                            capture_output=True, text=True, check=True)
+    attached = float(result.stdout.split()[-1])
+    print(f"bank of {bank.memory.size / 1024:.1f} KB: create {created * 1000:.2f} ms, "
+          f"attach + Sounds from another process {attached * 1000:.2f} ms "
+          f"(each process still copies {bank.memory.size / 1024:.1f} KB into the mixer)")
+    bank.close()
+
+def time_bank_attach(name):
+    bootstrap(display=False, fonts=False)
+    start = time.perf_counter()
+    bank = SampleBank.attach(name)
+    sounds = bank.sounds()
+    elapsed = time.perf_counter() - start
+    del sounds
+    bank.close()
+    return elapsed
+
+def bench_voices():
+    """Holding a movement key for two seconds: a play() per frame vs the voice pool"""
+    sounds = {name: AUDIO_CACHE.sound(generator) for name, generator in SOUND_EFFECTS.items()}
+    channels = [pygame.mixer.Channel(i) for i in range(pygame.mixer.get_num_channels())]
+    
+    def hold(label, frame):
+        busy = []
+        cost = 0.0
+        for _ in range(2 * FPS):
+            start = time.perf_counter()
+            frame()
+            cost += time.perf_counter() - start
+            busy.append(sum(channel.get_busy() for channel in channels))
+            time.sleep(STEP)
+        pygame.mixer.stop()
+        print(f"{label:<18} {cost / (2 * FPS) * 1e6:7.1f} us/frame   busy channels: "
+              f"mean {sum(busy) / len(busy):4.1f}, peak {max(busy)}")
+    
+    hold("play() per frame", sounds['move'].play)
+    voices = VoicePool(sounds)
+    channels = [pygame.mixer.Channel(i) for i in range(pygame.mixer.get_num_channels())]
+    hold("voice pool", lambda: voices.hold('move', True))
+    voices.stop()
+    print(voices.report())
+
+def measure(function, repeats=3):
+    """Best wall time (seconds) and peak traced allocation (bytes) of function()"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def bench_synth():
+    """Vectorised lofi_music against the original per-note loops"""
+    reference_time, reference_peak = measure(SoundGenerator.lofi_music_reference)
+    synth_time, synth_peak = measure(SoundGenerator.lofi_music)
+    difference = np.abs(SoundGenerator.lofi_music_reference().astype(np.int32) - SoundGenerator.lofi_music())
+    print(f"{'':<22} {'time':>10} {'peak memory':>12}")
+    print(f"{'lofi_music_reference':<22} {reference_time * 1000:8.1f} ms {reference_peak / 2**20:9.1f} MiB")
+    print(f"{'lofi_music':<22} {synth_time * 1000:8.1f} ms {synth_peak / 2**20:9.1f} MiB")
+    print(f"speedup {reference_time / synth_time:.2f}x, peak memory {reference_peak / synth_peak:.2f}x lower, "
+          f"max sample difference {difference.max()}")
+    for name, generator in SOUND_EFFECTS.items():
+        effect_time, effect_peak = measure(generator)
+        print(f"{generator.__name__:<22} {effect_time * 1000:8.2f} ms {effect_peak / 2**20:9.2f} MiB")
+
+def bench_music_stream():
+    """Peak memory and time for a minute of music: whole lofi_music loop vs MusicStream blocks"""
+    def stream_minute():
+        stream = MusicStream(seed=0)
+        for _ in range(-(-60 * SAMPLE_RATE // stream.block)):
+            stream.next_block()
+    
+    loop_time, loop_peak = measure(SoundGenerator.lofi_music)
+    stream_time, stream_peak = measure(stream_minute)
+    print(f"{'lofi_music (60 s)':<20} {loop_time * 1000:8.1f} ms {loop_peak / 2**20:8.2f} MiB")
+    print(f"{'MusicStream (60 s)':<20} {stream_time * 1000:8.1f} ms {stream_peak / 2**20:8.2f} MiB "
+          f"({60 / stream_time:.0f}x real time)")
+
+def bench_snapshot():
+    """Size and time of packing, writing and restoring a mid-round Game snapshot"""
+    simulation = Simulation(seed=0).run(frames=5000)
+    game = simulation.game
+    data = Snapshot.pack(game)
+    count = 2000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "game.snap")
+        pack_time = measure(lambda: [Snapshot.pack(game) for _ in range(count)])[0] / count
+        with open(path, "w+b") as file:
+            write_time = measure(lambda: [Snapshot.write(game, file) for _ in range(count)])[0] / count
+        restored = Game(headless=True)
+        restore_time = measure(lambda: [Snapshot.read(restored, path) for _ in range(count)])[0] / count
+    assert Snapshot.pack(restored) == data
+    print(f"snapshot: {len(data)} bytes ({len(game.turtles)} dolls in the machine, {len(game.won_turtles)} won)")
+    print(f"pack {pack_time * 1e6:7.1f} us   write {write_time * 1e6:7.1f} us   read+restore {restore_time * 1e6:7.1f} us")
+
+def bench_cabinets():
+    """Memory per cabinet and frames per second with N cabinets in one CabinetHost"""
+    assets = GameAssets.shared()
+    steps = 120
+    print(f"{'cabinets':>8} {'state KiB':>10} {'screen MiB':>11} {'host steps/s':>13} {'cabinet frames/s':>17}")
+    for count in (1, 4, 16, 64):
+        tracemalloc.start()
+        host = CabinetHost(count, assets=assets)
+        state = tracemalloc.get_traced_memory()[0] / count
+        tracemalloc.stop()
+        # Screen pixels are allocated by SDL, outside tracemalloc's view
+        screen = host.cabinets[0].game.screen
+        screen_bytes = screen.get_bytesize() * screen.get_width() * screen.get_height()
+        host.step()
+        host.draw()  # First draw of each cabinet is a full redraw
+        start = time.perf_counter()
+        for _ in range(steps):
+            host.step()
+            host.draw()
+        elapsed = time.perf_counter() - start
+        print(f"{count:>8} {state / 2**10:10.1f} {screen_bytes / 2**20:11.2f} "
+              f"{steps / elapsed:13.1f} {count * steps / elapsed:17.0f}")
+
+def bench_render():
+    """Draw time per frame of the surface and texture renderers, on a real and the dummy video driver
+    
+    The texture renderer runs on SDL's software renderer in both, so it can
+    be compared wherever the benchmark runs.
+    """
+    assets = GameAssets(sound=False)
+    frames = 600
+    original = os.environ.get("SDL_VIDEODRIVER")
+    print(f"{'driver':<10} {'renderer':<9} {'draw ms/frame':>14} {'worst ms':>9} {'draw calls':>11}")
+    for driver in (original, "dummy"):
+        pygame.display.quit()
+        if driver is None:
+            os.environ.pop("SDL_VIDEODRIVER", None)
+        else:
+            os.environ["SDL_VIDEODRIVER"] = driver
+        try:
+            pygame.display.init()
+        except pygame.error as e:
+            print(f"{driver or 'default':<10} unavailable: {e}")
+            continue
+        name = pygame.display.get_driver()
+        for kind in ("surface", "software"):
+            game = Game(seed=0, assets=assets, sound=False, renderer=kind)
+            if kind != "surface" and not isinstance(game.renderer, TextureRenderer):
+                continue  # Game() has said there is no software renderer
+            simulation = Simulation(STRATEGIES["jittered"]("0:player"), game=game)
+            game.draw()  # Uploads textures and does the first full redraw
+            times = []
+            calls = 0
+            for _ in range(frames):
+                simulation.step()
+                start = time.perf_counter()
+                game.draw()
+                times.append(time.perf_counter() - start)
+                calls += game.renderer.draw_calls
+            print(f"{name:<10} {kind:<9} {sum(times) / frames * 1000:14.3f} {max(times) * 1000:9.3f} "
+                  f"{calls / frames:11.1f}")
+            del simulation, game
+    pygame.display.quit()
+    if original is None:
+        os.environ.pop("SDL_VIDEODRIVER", None)
+    else:
+        os.environ["SDL_VIDEODRIVER"] = original
+
+def bench_scale():
+    """Time ScaledDisplay scaling full-screen and typical dirty frames up to common panel sizes"""
+    frames = 200
+    background = GameAssets.build_background()
+    cases = (
+        ("full screen", [pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]),
+        # What a moving claw and the coin timer dirty in a playing frame
+        ("claw + timer", [pygame.Rect(375, 100, 50, 220), pygame.Rect(320, 120, 160, 50)]),
+    )
+    print(f"{'window':>10} {'scale':>6} {'dirty':<13} {'dirty px':>9} {'ms/frame':>9} {'allocated':>10}")
+    for size in ((800, 600), (1280, 1024), (1920, 1080), (2560, 1440), (3840, 2160)):
+        display = ScaledDisplay(pygame.Surface(size), display=False)
+        display.screen.blit(background, (0, 0))
+        for label, dirty in cases:
+            display.present(dirty)
+            display.total_time = 0.0
+            display.frames = 0
+            tracemalloc.start()
+            for _ in range(frames):
+                display.present(dirty)
+            allocated = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            mean = display.total_time / display.frames * 1000
+            area = sum(rect.width * rect.height for rect in dirty)
+            print(f"{size[0]:>5}x{size[1]:<4} {display.scale:>5}x {label:<13} {area:>9} {mean:9.3f} {allocated:8d} B")
+
+def bench_grab_log():
+    """Append cost and query times of a GrabLog of millions of attempts"""
+    rng = np.random.default_rng(0)
+    rows = 5_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        log = GrabLog(directory)
+        doll = Turtle(0, 0, TURTLE_COLORS[0])
+        appends = 20000
+        append_time = measure(lambda: [log.append(GrabLog.SUCCESS, 400.0, 200.0, doll, 5.0, 2.5)
+                                       for _ in range(appends)], repeats=1)[0] / appends
+        start = time.perf_counter()
+        log.extend(outcome=rng.integers(0, len(GrabLog.OUTCOMES), rows, dtype=np.uint8),
+                   claw_x=rng.uniform(148, 652, rows).astype(np.float32),
+                   depth=rng.uniform(0, 370, rows).astype(np.float32),
+                   species=rng.integers(-1, len(SPECIES), rows, dtype=np.int8),
+                   color=rng.integers(0, 5, rows, dtype=np.uint8),
+                   seconds_left=rng.uniform(0, 10, rows).astype(np.float32),
+                   grab_time=rng.uniform(0, 10, rows).astype(np.float32))
+        log.close()
+        extend_time = time.perf_counter() - start
+        
+        reader = GrabLog(directory, writable=False)
+        size = sum(os.path.getsize(reader.path(name)) for name in GrabLog.COLUMNS)
+        print(f"{len(reader):,} attempts in {size / 2**20:.1f} MiB; append {append_time * 1e6:.1f} us, "
+              f"bulk extend {extend_time:.2f} s")
+        for name, query in (("outcome_counts", reader.outcome_counts), ("heatmap", reader.heatmap),
+                            ("slip_rates", reader.slip_rates), ("time_to_grab", reader.time_to_grab)):
+            elapsed, peak = measure(query)
+            print(f"{name:<15} {elapsed * 1000:8.1f} ms  peak {peak / 2**20:6.1f} MiB")
+        reader.close()
+
+def bench_layout():
+    """Time generating doll layouts with each method, up to 10k dolls"""
+    for count in (14, 1000, 10000):
+        # A machine wide enough to hold count dolls at about half the packing limit
+        side = int(np.sqrt(count * 2 * (2 * Doll.size) ** 2)) + 4 * Doll.size
+        bounds = DollLayout.BOUNDS if count <= 14 else pygame.Rect(0, 0, side, side)
+        for method in ("poisson", "grid"):
+            layout = DollLayout(count, bounds=bounds, method=method, species_weights=(3, 1))
+            seeds = iter(range(1000))
+            elapsed, peak = measure(lambda: layout.generate(next(seeds)))
+            placement = layout.generate(0)
+            store = DollStore(count)
+            start = time.perf_counter()
+            layout.spawn(placement, store)
+            spawned = time.perf_counter() - start
+            print(f"{count:>6} dolls {method:<8} generate {elapsed * 1000:7.2f} ms  peak {peak / 1024:8.1f} KB  "
+                  f"spawn {spawned * 1000:7.2f} ms")
+
+def bench_telemetry():
+    """emit() cost and drops when the exporter's sink is far slower than the game"""
+    class SlowTelemetry(Telemetry):
+        async def write(self, batch):
+            await asyncio.sleep(0.05)  # A sink that takes 50 ms per batch
+            self.sent += len(batch)
+            self.batches += 1
+    
+    async def play(frames, events_per_frame, path):
+        telemetry = SlowTelemetry(path)
+        telemetry.start()
+        worst = 0.0
+        for frame in range(frames):
+            start = time.perf_counter()
+            for _ in range(events_per_frame):
+                telemetry.emit("bench", frame=frame)
+            worst = max(worst, time.perf_counter() - start)
+            await asyncio.sleep(1 / FPS)
+        await telemetry.close()
+        return telemetry, worst
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "telemetry.jsonl")
+        results = [(events_per_frame, *asyncio.run(play(120, events_per_frame, path)))
+                   for events_per_frame in (1, 10, 100)]
+    for events_per_frame, telemetry, worst in results:
+        emitted = 120 * events_per_frame
+        print(f"{events_per_frame:>4} events/frame: worst emit burst {worst * 1e6:8.1f} us "
+              f"({worst / events_per_frame * 1e6:.2f} us/event), {telemetry.sent} exported "
+              f"in {telemetry.batches} batches, {telemetry.dropped} of {emitted} dropped")
+
+def bench_grab_query():
+    """check_grab query cost against doll count: grid index vs linear scan
+    
+    The field grows with the doll count so density stays that of a real
+    round, as in a very large machine or many machines sharing one index.
+    """
+    rng = random.Random(0)
+    print(f"{'dolls':>7} {'scan':>12} {'index':>12} {'speedup':>8}")
+    for count in (14, 100, 1000, 10000):
+        scale = (count / 14) ** 0.5
+        width, height = int(500 * scale), int(330 * scale)
+        dolls = [Turtle(rng.randint(0, width), rng.randint(0, height), TURTLE_COLORS[0])
+                 for _ in range(count)]
+        queries = [pygame.Rect(rng.randint(0, width) - 15, rng.randint(0, height), 30, 15)
+                   for _ in range(2000)]
+        index = DollIndex()
+        for doll in dolls:
+            index.add(doll)
+        
+        def scan():
+            for claw_rect in queries:
+                for doll in dolls:
+                    if claw_rect.colliderect(doll.rect) and not doll.caught:
+                        break
+        
+        def indexed():
+            for claw_rect in queries:
+                for doll in index.query(claw_rect):
+                    if not doll.caught:
+                        break
+        
+        scan_time = measure(scan, repeats=3)[0] / len(queries)
+        index_time = measure(indexed, repeats=3)[0] / len(queries)
+        print(f"{count:>7} {scan_time * 1e6:9.2f} us {index_time * 1e6:9.2f} us {scan_time / index_time:7.1f}x")
+
+def bench_doll_store():
+    """Memory per doll and gravity cost for 10k dolls: DollStore vs one object each"""
+    class ObjectDoll:
+        # Doll state as it was before DollStore: an instance dict and a Rect
+        def __init__(self, x, y, color):
+            self.x = x
+            self.y = y
+            self.color = color
+            self.size = 24
+            self.caught = False
+            self.falling = False
+            self.fall_speed = 0
+            self.original_y = y
+            self.rect = pygame.Rect(x - self.size, y - self.size, self.size * 2, self.size * 2)
+        
+        def update(self):
+            if self.falling:
+                self.fall_speed += 0.5
+                self.y += self.fall_speed
+                if self.y >= self.original_y:
+                    self.y = self.original_y
+                    self.falling = False
+                    self.fall_speed = 0
+                self.rect = pygame.Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
+    
+    count, frames = 10000, 20
+    rng = random.Random(0)
+    positions = [(rng.randint(150, 650), rng.randint(300, 460)) for _ in range(count)]
+    color = TURTLE_COLORS[0]
+    
+    def build_objects():
+        return [ObjectDoll(x, y, color) for x, y in positions]
+    
+    def build_store():
+        store = DollStore(count)
+        return store, [Turtle(x, y, color, store) for x, y in positions]
+    
+    def drop(dolls):
+        # Lift every doll and let go, as if each one slipped from the claw
+        for doll in dolls:
+            doll.y = doll.original_y - 150
+            doll.fall_speed = 0
+            doll.falling = True
+    
+    objects = build_objects()
+    store, views = build_store()
+    
+    def fall_objects():
+        drop(objects)
+        for _ in range(frames):
+            for doll in objects:
+                doll.update()
+    
+    def fall_store():
+        drop(views)
+        for _ in range(frames):
+            store.fall()
+    
+    # Both must land every doll in the same place
+    fall_objects()
+    fall_store()
+    assert all(a.y == b.y and a.falling == b.falling for a, b in zip(objects, views))
+    
+    object_memory = measure(build_objects, repeats=1)[1] / count
+    store_memory = measure(build_store, repeats=1)[1] / count
+    object_time = (measure(fall_objects, repeats=3)[0] - measure(lambda: drop(objects))[0]) / frames
+    store_time = (measure(fall_store, repeats=3)[0] - measure(lambda: drop(views))[0]) / frames
+    print(f"{count} dolls, {frames} falling frames")
+    print(f"objects: {object_memory:6.0f} bytes/doll, {object_time * 1e3:7.3f} ms/frame")
+    print(f"store:   {store_memory:6.0f} bytes/doll, {store_time * 1e3:7.3f} ms/frame "
+          f"({object_time / store_time:.0f}x faster)")
+
+def bench_physics():
+    """Frame cost of dropping a whole layout of dolls at once until the pile settles"""
+    for count in (100, 1000, 4000):
+        # A wide, shallow machine so the dolls stack several deep on the floor
+        width = int(count * 2 * Doll.size * 0.6) + 4 * Doll.size
+        bounds = pygame.Rect(0, 0, width, 12 * 2 * Doll.size)
+        layout = DollLayout(count, bounds=bounds, method="grid")
+        store = DollStore(count)
+        dolls = layout.spawn(layout.generate(0), store)
+        index = DollIndex()
+        for doll in dolls:
+            index.add(doll)
+        # Every doll lets go 300 px up and falls towards the floor
+        store.original_y[:count] = bounds.bottom
+        store.y[:count] -= 300
+        store.falling[:count] = True
+        store.at_rest = False
+        
+        # Time the physics step and the re-bucketing of moved dolls apart
+        steps = []
+        while not store.at_rest and len(steps) < 1000:
+            start = time.perf_counter()
+            slots, previous_y = store.fall()
+            stepped = time.perf_counter()
+            index.move_fallen(store, slots, previous_y)
+            steps.append((stepped - start, time.perf_counter() - stepped))
+        
+        # Closest pair of settled dolls, which should be no nearer than DIAMETER
+        x, y = store.x[:count], store.y[:count]
+        distance = np.hypot(x[:, None] - x, y[:, None] - y)
+        np.fill_diagonal(distance, np.inf)
+        fall, moves = np.array(steps).T * 1000
+        total = fall + moves
+        print(f"{count:>5} dolls: settled in {len(steps)} steps  fall() mean {fall.mean():5.2f} ms "
+              f"worst {fall.max():5.2f} ms  with index moves mean {total.mean():6.2f} ms "
+              f"worst {total.max():6.2f} ms  (budget {1000 / FPS:.1f} ms)  closest pair {distance.min():4.1f} px")
+
+def bench_simulation():
+    """Simulated frames per second of the headless game loop"""
+    simulation = Simulation(seed=0).run(rounds=200)
+    print(simulation.report())
+
+def bench_monte_carlo():
+    """Monte-Carlo throughput and scaling with the number of worker processes"""
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    baseline = None
+    for workers in worker_counts:
+        result = monte_carlo("perfect", rounds=400 * workers, workers=workers, batch_rounds=100)
+        rate = result.rounds / result.elapsed
+        baseline = baseline or rate
+        print(f"{workers:>3} workers: {rate:8,.0f} rounds/s, speedup {rate / baseline:5.2f}x, "
+              f"efficiency {rate / baseline / workers:6.1%}")
+
+BENCHMARKS = {
+    "audio-startup": bench_audio_startup,
+    "cabinets": bench_cabinets,
+    "doll-store": bench_doll_store,
+    "grab-log": bench_grab_log,
+    "grab-query": bench_grab_query,
+    "layout": bench_layout,
+    "monte-carlo": bench_monte_carlo,
+    "music-stream": bench_music_stream,
+    "physics": bench_physics,
+    "render": bench_render,
+    "sample-bank": bench_sample_bank,
+    "scale": bench_scale,
+    "simulation": bench_simulation,
+    "snapshot": bench_snapshot,
+    "synth": bench_synth,
+    "telemetry": bench_telemetry,
+    "voices": bench_voices,
+}
+
+def display_size(text):
+    """--display argument: WIDTHxHEIGHT, or fullscreen as (0, 0)"""
+    if text == "fullscreen":
+        return (0, 0)
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT or fullscreen, not {text!r}")
+    return (width, height)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Claw Machine - Pixel Art Edition")
+    parser.add_argument("--verify-sprites", action="store_true",
+                        help="check cached doll sprites against primitive rendering and exit")
+    parser.add_argument("--bench", choices=sorted(BENCHMARKS),
+                        help="run a benchmark and exit")
+    parser.add_argument("--simulate", type=int, metavar="ROUNDS",
+                        help="play ROUNDS rounds headless with a scripted player and exit")
+    parser.add_argument("--claw-timings", action="store_true",
+                        help="with --simulate, report how many frames the claw spends in each state")
+    parser.add_argument("--monte-carlo", type=int, metavar="ROUNDS",
+                        help="estimate win rates from ROUNDS rounds on a process pool and exit "
+                             "(about 70 rounds/s per core; progress and an ETA go to stderr)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="jittered",
+                        help="aiming strategy for --monte-carlo (default: jittered)")
+    parser.add_argument("--workers", type=int,
+                        help="worker processes for --monte-carlo (default: one per core)")
+    parser.add_argument("--speed", type=float, default=1.0, metavar="FACTOR",
+                        help="run the game logic FACTOR times faster than real time (default: 1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each frame's phases and show a frame-time overlay (F3 toggles it)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="profile and write the last minute of frames to FILE as a Chrome trace on exit")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record this session's input to FILE for --replay")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay a session recorded with --record")
+    parser.add_argument("--from-step", type=int, default=0, metavar="STEP",
+                        help="start --replay at this update step (default: 0)")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay: replay without a window as fast as possible and print the result")
+    parser.add_argument("--snapshot", metavar="FILE",
+                        help="save the game to FILE twice a second and resume from it on launch")
+    parser.add_argument("--cabinets", type=int, metavar="N",
+                        help="run N self-playing cabinets in one window (attract mode)")
+    parser.add_argument("--telemetry", metavar="TARGET",
+                        help="export game events as JSON lines to a file or unix:SOCKET, from an asyncio main loop")
+    parser.add_argument("--sample-bank", metavar="NAME",
+                        help="render sound effects once per host and share the samples with other games "
+                             "through shared memory")
+    parser.add_argument("--dolls", type=int, metavar="N",
+                        help="fill the machine with N dolls from a generated layout (with --simulate or to play)")
+    parser.add_argument("--layout", choices=("poisson", "grid"), default="poisson",
+                        help="how --dolls are placed: Poisson-disk scatter or jittered grid (default: poisson)")
+    parser.add_argument("--renderer", choices=("surface", "texture", "software"), default="surface",
+                        help="draw with software-blitted surfaces, or with textures on an accelerated "
+                             "or SDL's software renderer (default: surface)")
+    parser.add_argument("--display", type=display_size, metavar="WIDTHxHEIGHT",
+                        help="open a window this big (or 'fullscreen') and scale the game up to fit it "
+                             "by a whole number, with black bars")
+    parser.add_argument("--grab-log", metavar="DIR",
+                        help="append every grab attempt to a columnar log in DIR (playing or with --simulate)")
+    parser.add_argument("--grab-stats", metavar="DIR",
+                        help="print success by claw x, slip rates and time to grab from a --grab-log and exit")
+    parser.add_argument("--startup", action="store_true",
+                        help="show the start screen once, print where the start-up time went and exit")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed for --simulate and --monte-carlo (default: 0)")
+    args = parser.parse_args(argv)
+    if args.display is not None and args.renderer != "surface":
+        parser.error("--display scales the surface renderer only")
+    layout = None
+    if args.dolls is not None:
+        if args.record or args.replay:
+            parser.error("--dolls layouts are not recorded in input journals")
+        layout = DollLayout(args.dolls, method=args.layout)
+        try:
+            layout.generate(0)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.grab_stats:
+        try:
+            log = GrabLog(args.grab_stats, writable=False)
+        except OSError as e:
+            parser.error(f"cannot read grab log {args.grab_stats}: {e}")
+        print(log.report())
+        return
+    
+    if args.monte_carlo is not None:
+        print(monte_carlo(args.strategy, args.monte_carlo, args.workers, args.seed,
+                          progress=print_progress).report())
+        pygame.quit()
+        return
+    
+    if args.simulate is not None:
+        simulation = Simulation(seed=args.seed, game=Game(headless=True, seed=args.seed, layout=layout))
+        if args.claw_timings:
+            timings = ClawTimings()
+            simulation.game.claw_hooks.append(timings)
+        if args.grab_log:
+            simulation.game.start_grab_log(args.grab_log)
+        simulation.run(rounds=args.simulate)
+        print(simulation.report())
+        if args.claw_timings:
+            print(timings.report())
+        if args.grab_log:
+            simulation.game.grab_log.close()
+            print(f"Grab log {args.grab_log} holds {simulation.game.grab_log.count} attempts")
+        pygame.quit()
+        return
+    
+    if args.bench:
+        bootstrap()
+        BENCHMARKS[args.bench]()
+        pygame.quit()
+        return
+    
+    if args.verify_sprites:
+        bootstrap(mixer=False)
+        pygame.display.set_mode((1, 1))
+        mismatches = SPRITES.verify()
+        for species, color in mismatches:
+            print(f"Sprite mismatch: {species} {color}")
+        print(f"{len(SPRITES.sprites)} sprites checked, {len(mismatches)} mismatches")
+        pygame.quit()
+        sys.exit(1 if mismatches else 0)
+    
+    if args.cabinets:
+        bootstrap(mixer=False)
+        window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption(f"🎮 Claw Machine - {args.cabinets} cabinets")
+        CabinetHost(args.cabinets, seed=args.seed, assets=GameAssets(sound=False)).run(window, args.speed)
+        pygame.quit()
+        return
+    
+    if args.replay:
+        if not args.headless:
+            bootstrap()
+        replay = Replay(args.replay, headless=args.headless)
+        start = time.perf_counter()
+        replay.seek(args.from_step)
+        if args.headless:
+            replay.run()
+            game = replay.game
+            print(f"Replayed {len(replay)} steps in {time.perf_counter() - start:.2f} s: "
+                  f"score {game.score}, {game.coins} coins left, round over: {game.round_over}")
+            pygame.quit()
+            return
+        if args.profile or args.trace:
+            replay.game.enable_profiler(args.trace)
+        replay.play(args.speed)
+        return
+    
+    # Only the interactive game needs every subsystem
+    sound = bootstrap()
+    if args.sample_bank and sound:
+        try:
+            bank = SampleBank.open(args.sample_bank)
+        except (OSError, TimeoutError) as e:
+            print(f"Could not open sample bank - loading sounds separately: {e}")
+        else:
+            print(f"{'Created' if bank.owner else 'Attached to'} sample bank {args.sample_bank}")
+            GameAssets.shared_assets = GameAssets(bank=bank)
+            if bank.owner:
+                atexit.register(bank.close)  # Other games may still attach until this one exits
+            else:
+                bank.close()  # The Sounds hold their own copies of the samples
+    
+    start = time.perf_counter()
+    try:
+        game = Game(layout=layout, sound=sound, renderer=args.renderer, display_size=args.display)
+    except ValueError as e:
+        parser.error(str(e))
+    STARTUP.record("Game()", start)
+    if args.snapshot:
+        if os.path.exists(args.snapshot):
+            try:
+                start = time.perf_counter()
+                Snapshot.read(game, args.snapshot)
+                game.message = "Welcome back!"
+                game.message_timer = 120
+                print(f"Resumed from {args.snapshot} in {(time.perf_counter() - start) * 1000:.2f} ms")
+            except (OSError, ValueError) as e:
+                print(f"Could not resume from {args.snapshot} - starting fresh: {e}")
+        game.start_snapshots(args.snapshot)
+    if args.record:
+        game.journal = InputJournal(args.record, game)
+    if args.grab_log:
+        game.start_grab_log(args.grab_log)
+    if args.profile or args.trace:
+        game.enable_profiler(args.trace)
+    if args.startup:
+        start = time.perf_counter()
+        next(game.frames(args.speed))  # Draw and show the start screen
+        STARTUP.record("first frame", start)
+        print(STARTUP.report())
+        game.shutdown()
+        pygame.quit()
+        return
+    if args.telemetry:
+        asyncio.run(game.run_async(args.speed, telemetry=Telemetry(args.telemetry)))
+        return
+    game.run(args.speed)
+
+STARTUP.record("import", IMPORT_STARTED)
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    main()